@@ -0,0 +1,93 @@
+import numpy as np
+
+import sim
+from broadphase import aabbs_overlap
+from profiler import NULL_PROFILER
+from rigid_body_3d import RigidBody3D
+
+
+def body_levels(world, dt, max_travel=0.25, max_penetration=0.05, max_level=8):
+    # Substeps each body asks for: enough that it moves at most max_travel
+    # of its thinnest extent per substep, and more while the last step's
+    # contacts sank deeper than max_penetration of it
+    n = world.count
+    extent = np.maximum((world.bb_max[:n] - world.bb_min[:n]).min(axis=1), 1e-9)
+    speed = np.linalg.norm(world.velocity[:n], axis=1)
+    travel = np.ceil(speed * dt / (max_travel * extent))
+    sinking = np.ceil(world.penetration[:n] / (max_penetration * extent))
+    levels = np.maximum(travel, sinking).clip(1, max_level).astype(int)
+    levels[~world.awake[:n]] = 1
+    return levels
+
+
+def group_levels(levels, pairs):
+    # Bodies in contact end up with the highest level of their contact
+    # group, spread along the pairs until nothing changes
+    levels = levels.copy()
+    a, b = pairs[:, 0], pairs[:, 1]
+    while len(a):
+        shared = np.maximum(levels[a], levels[b])
+        if np.array_equal(levels[a], shared) and np.array_equal(levels[b], shared):
+            break
+        np.maximum.at(levels, a, shared)
+        np.maximum.at(levels, b, shared)
+    return levels
+
+
+class AdaptiveStepper:
+    # Drop-in for sim.step_physics that splits the step only for the contact
+    # groups that need it; everything else takes the step in one go
+    def __init__(self, max_travel=0.25, max_penetration=0.05, max_level=8):
+        self.max_travel = max_travel
+        self.max_penetration = max_penetration
+        self.max_level = max_level
+        self.levels = np.zeros(0, dtype=int)
+        # Substeps of the most divided group, and body updates in total,
+        # during the last step
+        self.substeps = 0
+        self.body_steps = 0
+
+    def step(self, dt, gravity=9.8, player=None, keymap=None, profiler=NULL_PROFILER, ccd=True):
+        world = RigidBody3D.world
+        world.store_previous()
+        with profiler.phase("substep_levels"):
+            levels = body_levels(
+                world, dt, self.max_travel, self.max_penetration, self.max_level
+            )
+            # Groups are built from the boxes swept over the step, so a fast
+            # body shares its substeps with everything it can reach
+            reach = RigidBody3D.find_pairs(aabbs=world.get_swept_aabbs(dt))
+            levels = group_levels(levels, reach)
+            # The pairs touching now, in the same order find_pairs gives
+            mins, maxs = world.get_aabbs()
+            a, b = reach[:, 0], reach[:, 1]
+            pairs = reach[aabbs_overlap(mins[a], maxs[a], mins[b], maxs[b])]
+        # Measured again by the passes below for the next step
+        world.penetration[: world.count] = 0
+        self.levels = levels
+        self.substeps = int(levels.max()) if len(levels) else 1
+        self.body_steps = int(levels.sum())
+
+        # Nothing has moved since the broadphase above, so each group's first
+        # substep reuses its pairs; groups are closed under them, the swept
+        # boxes contain the current ones
+        if self.substeps == 1:
+            sim.advance(dt, gravity, player, keymap, profiler, ccd, pairs=pairs)
+            return
+
+        for level in np.unique(levels).tolist():
+            rows = np.flatnonzero(levels == level)
+            driven = player if player is not None and levels[player._index] == level else None
+            for substep in range(level):
+                first = substep == 0
+                sim.advance(
+                    dt / level,
+                    gravity,
+                    driven if first else None,
+                    keymap,
+                    profiler,
+                    ccd,
+                    rows,
+                    input_dt=dt,
+                    pairs=pairs[levels[pairs[:, 0]] == level] if first else None,
+                )
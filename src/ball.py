@@ -1,30 +1,36 @@
 from rigid_body_3d import RigidBody3D
+from physics_world import column_property
 import numpy as np
-from OpenGL.GL import glPushMatrix, glPopMatrix
-from OpenGL.GL import (
-    glBegin,
-    glEnd,
-    glVertex3f,
-    glColor3f,
-    GL_LINES,
-    glTranslatef,
-    glRotatef,
-    glLineWidth,
-)
 
 
 class Ball(RigidBody3D):
-    def __init__(self, position=None, velocity=None, mass=1.0, radius=0.4, force=20, **kwargs):
+    radius = column_property("radius")
+    rotation_axis = column_property("rotation_axis")
+    rotation_angle = column_property("rotation_angle")
+    yaw = column_property("yaw")
+    color = column_property("color")
+    force = column_property("force")
+    kind = 1
+
+    def __init__(self, position=None, velocity=None, mass=1.0, radius=0.4, force=20, color=(1.0, 1.0, 0.0), **kwargs):
         super().__init__(position=position, velocity=velocity, mass=mass, **kwargs)
         self.radius = radius
+        self.color = color
         self.rotation_axis = [0.0, 0.0, 0.0]
         self.rotation_angle = 0.0
         self.force = force
         self.yaw = 0.0
 
+    @classmethod
+    def create_many(cls, count, radius=0.4, force=20, color=(1.0, 1.0, 0.0), **kwargs):
+        return super().create_many(count, radius=radius, force=force, color=color, **kwargs)
+
     def update(self, dt, keymap, gravity, ground_height=0.4):
         super().update(dt, gravity=gravity, ground_height=ground_height)
+        self.apply_input(dt, keymap)
+        self.update_rolling(dt)
 
+    def apply_input(self, dt, keymap):
         if keymap.get("left", False):
             self.yaw += 120 * dt
         if keymap.get("right", False):
@@ -51,16 +57,18 @@ class Ball(RigidBody3D):
         if keymap.get("space", False):
             if self.on_ground:
                 self.velocity = forward * self.force
+                self.wake()
 
         # Tambahan: loncat ke atas dengan tombol X
         if keymap.get("x", False):
             if self.on_ground:
                 self.velocity[1] = self.force  # Lompatan vertikal
+                self.wake()
 
         if keymap.get("z", False):
             self.velocity = np.array([0, 0, 0], dtype=np.float32)
 
-        # Roll
+    def update_rolling(self, dt):
         v = self.velocity.copy()
         v[1] = 0
         speed = np.linalg.norm(v)
@@ -72,12 +80,30 @@ class Ball(RigidBody3D):
                 angle_delta = (speed * dt) / self.radius
                 self.rotation_angle += np.degrees(angle_delta)
 
-    def draw_arrow(self):
+    def draw_arrow(self, position=None):
+        # position: where to draw, the interpolated render position in main
+        try:
+            from OpenGL.GL import (
+                glPushMatrix,
+                glPopMatrix,
+                glBegin,
+                glEnd,
+                glVertex3f,
+                glColor3f,
+                GL_LINES,
+                glTranslatef,
+                glRotatef,
+                glLineWidth,
+            )
+        except ImportError:
+            return
+        if position is None:
+            position = self.position
         glPushMatrix()
         glTranslatef(
-            self.position[0],
-            self.position[1],
-            self.position[2],
+            position[0],
+            position[1],
+            position[2],
         )
         glRotatef(self.yaw, 0, 1, 0)
 
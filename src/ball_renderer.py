@@ -0,0 +1,67 @@
+import numpy as np
+from OpenGL.GL import *
+
+from lod import SphereLOD
+from mesh_buffer import MeshBuffer
+from mesh_builder import build_instance_matrices, meridian_lines
+
+
+class BallRenderer:
+    def __init__(self, lod=None, line_color=(0.2, 0.2, 0.2)):
+        self.lod = lod or SphereLOD(levels=((32, 16),), thresholds=())
+        lines = meridian_lines()
+        self.lines = MeshBuffer(lines, lines, mode=GL_LINES)
+        self.line_color = line_color
+
+    def draw(self, matrices, colors, levels=None):
+        # Each mesh is bound once; each ball only costs a matrix and a
+        # draw call instead of rebuilding its geometry
+        levels = np.zeros(len(matrices), dtype=int) if levels is None else levels
+        glPushAttrib(GL_ENABLE_BIT | GL_LINE_BIT | GL_CURRENT_BIT)
+        # Instance matrices scale by the radius, keep normals unit length
+        glEnable(GL_NORMALIZE)
+        for level, sphere in enumerate(self.lod.get_buffers()):
+            batch = np.flatnonzero(levels == level)
+            if len(batch) == 0:
+                continue
+            sphere.bind(use_colors=False)
+            for matrix, color in zip(matrices[batch], colors[batch]):
+                glPushMatrix()
+                glMultMatrixf(matrix)
+                glColor3f(*color)
+                glDrawArrays(sphere.mode, 0, sphere.vertex_count)
+                glPopMatrix()
+            sphere.unbind()
+
+        # Meridians are skipped on the coarsest level of a multi-level LOD
+        coarsest = len(self.lod.levels) - 1
+        lined = matrices[(levels < coarsest) | (coarsest == 0)]
+        glColor3f(*self.line_color)
+        glLineWidth(2)
+        self.lines.bind(use_colors=False)
+        for matrix in lined:
+            glPushMatrix()
+            glMultMatrixf(matrix)
+            glDrawArrays(self.lines.mode, 0, self.lines.vertex_count)
+            glPopMatrix()
+        self.lines.unbind()
+        glPopAttrib()
+
+    def draw_world(
+        self, world, alpha=1.0, eye=None, fovy=45.0, viewport_height=600, frustum=None
+    ):
+        rows = np.flatnonzero(world.radius[: world.count] > 0)
+        positions = world.interpolated_positions(alpha)[rows]
+        radii = world.radius[rows]
+        if frustum is not None:
+            visible = frustum.contains_aabbs(
+                positions - radii[:, None], positions + radii[:, None]
+            )
+            rows, positions, radii = rows[visible], positions[visible], radii[visible]
+        matrices = build_instance_matrices(
+            positions, world.rotation_axis[rows], world.rotation_angle[rows], radii
+        )
+        levels = None
+        if eye is not None:
+            levels = self.lod.select(positions, radii, eye, fovy, viewport_height)
+        self.draw(matrices, world.color[rows], levels)
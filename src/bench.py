@@ -0,0 +1,195 @@
+import argparse
+import json
+import platform
+import sys
+import time
+
+import numpy as np
+
+import sim
+from broadphase import SpatialHashGrid, SweepAndPrune
+from collision_shape import CollisionShape
+from day_night_cycle import DayNightCycle, build_cycle_table
+from mesh_builder import (
+    build_ground_mesh,
+    build_instance_matrices,
+    half_sphere_triangles,
+    meridian_lines,
+)
+from r2d2_mesh import build_r2d2_mesh
+from rigid_body_3d import RigidBody3D
+
+SIZES = (10, 100, 1000, 10000)
+# Brute force would need every pair at 10k bodies
+BROADPHASES = {"sap": SweepAndPrune, "grid": SpatialHashGrid}
+
+
+def measure(function, repeats=5, min_time=0.2, setup=None):
+    # Per-call seconds of `repeats` rounds; each round loops the function
+    # long enough for min_time / repeats to smooth out timer noise. setup
+    # runs untimed before every round.
+    if setup is not None:
+        setup()
+    start = time.perf_counter()
+    function()
+    once = max(time.perf_counter() - start, 1e-7)
+    loops = max(1, int(min_time / repeats / once))
+    times = []
+    for _ in range(repeats):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        for _ in range(loops):
+            function()
+        times.append((time.perf_counter() - start) / loops)
+    return {
+        "median_ms": float(np.median(times) * 1000),
+        "min_ms": float(np.min(times) * 1000),
+        "loops": loops,
+        "repeats": repeats,
+    }
+
+
+def scene(count, broadphase="grid", seed=0):
+    # Fresh scene; returns a function that puts every body back where the
+    # scene started, so each round measures the same state instead of one
+    # that scatters or falls asleep as the rounds go on
+    sim.reset()
+    RigidBody3D.broadphase = BROADPHASES[broadphase]()
+    sim.create_walls()
+    sim.spawn_balls(count, seed=seed)
+    world = RigidBody3D.world
+    n = world.count
+    start = {name: getattr(world, name)[:n].copy() for name in world.columns}
+
+    def restore():
+        for name, column in start.items():
+            getattr(world, name)[:n] = column
+
+    return restore
+
+
+def physics_cases(sizes, broadphase="grid"):
+    dt = 1 / 120
+    for count in sizes:
+        restore = scene(count, broadphase)
+        world = RigidBody3D.world
+        yield f"physics.world_step[{count}]", lambda: world.step(dt), restore
+        restore = scene(count, broadphase)
+        bodies = list(RigidBody3D.instances)
+
+        def object_update():
+            for body in bodies:
+                RigidBody3D.update(body, dt)
+
+        yield f"physics.object_update[{count}]", object_update, restore
+        restore = scene(count, broadphase)
+        yield f"physics.body_collisions[{count}]", RigidBody3D.check_all_collisions, restore
+        restore = scene(count, broadphase)
+        yield (
+            f"physics.shape_collisions[{count}]",
+            CollisionShape.check_all_collisions_with_rigidbody,
+            restore,
+        )
+
+
+def mesh_cases(sizes):
+    yield "mesh.ground", lambda: build_ground_mesh(20, 1), None
+    yield "mesh.half_sphere", lambda: half_sphere_triangles(0.4, 32, 16), None
+    yield "mesh.r2d2", build_r2d2_mesh, None
+    yield "mesh.meridians", meridian_lines, None
+    rng = np.random.default_rng(0)
+    for count in sizes:
+        positions = rng.uniform(-20, 20, (count, 3))
+        axes = rng.normal(size=(count, 3))
+        angles = rng.uniform(0, 360, count)
+        radii = np.full(count, 0.4)
+        yield (
+            f"mesh.ball_matrices[{count}]",
+            lambda: build_instance_matrices(positions, axes, angles, radii),
+            None,
+        )
+
+
+def day_night_cases():
+    yield "day_night.build_table", lambda: build_cycle_table.__wrapped__(1440), None
+    cycle = DayNightCycle()
+
+    def frame():
+        cycle.update(1 / 60)
+        cycle.get_sky_color()
+        cycle.get_sun_position()
+        cycle.get_moon_position()
+
+    yield "day_night.frame", frame, None
+
+
+def run(sizes=SIZES, broadphase="grid", repeats=5, min_time=0.2, only=None, threads=1):
+    RigidBody3D.set_solver_threads(threads)
+    cases = [physics_cases(sizes, broadphase), mesh_cases(sizes), day_night_cases()]
+    results = {}
+    for group in cases:
+        for name, function, setup in group:
+            if only and not any(pattern in name for pattern in only):
+                continue
+            results[name] = measure(function, repeats, min_time, setup)
+            print(f"{name:40s} {results[name]['median_ms']:10.4f} ms", file=sys.stderr)
+    sim.reset()
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "broadphase": broadphase,
+            "threads": threads,
+        },
+        "results": results,
+    }
+
+
+def compare(current, baseline, threshold=1.25):
+    # (name, baseline ms, current ms, ratio) for every shared benchmark and
+    # the names that got slower than threshold times the baseline
+    rows, regressions = [], []
+    for name, result in current["results"].items():
+        if name not in baseline["results"]:
+            continue
+        before = baseline["results"][name]["median_ms"]
+        ratio = result["median_ms"] / before if before > 0 else float("inf")
+        rows.append((name, before, result["median_ms"], ratio))
+        if ratio > threshold:
+            regressions.append(name)
+    return rows, regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the physics, mesh and sky hot paths")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES))
+    parser.add_argument("--broadphase", choices=sorted(BROADPHASES), default="grid")
+    parser.add_argument("--threads", type=int, default=1, help="contact solver threads")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds spent per benchmark")
+    parser.add_argument("--only", nargs="+", help="run benchmarks whose name contains any of these")
+    parser.add_argument("--out", default="bench.json")
+    parser.add_argument("--baseline", help="earlier results to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25, help="slowdown ratio that counts as a regression")
+    args = parser.parse_args(argv)
+
+    current = run(args.sizes, args.broadphase, args.repeats, args.min_time, args.only, args.threads)
+    with open(args.out, "w") as file:
+        json.dump(current, file, indent=2)
+    print(f"wrote {len(current['results'])} results to {args.out}")
+
+    if args.baseline is None:
+        return 0
+    with open(args.baseline) as file:
+        baseline = json.load(file)
+    rows, regressions = compare(current, baseline, args.threshold)
+    for name, before, after, ratio in rows:
+        flag = "  REGRESSION" if name in regressions else ""
+        print(f"{name:40s} {before:10.4f} -> {after:10.4f} ms  x{ratio:.2f}{flag}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
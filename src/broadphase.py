@@ -0,0 +1,145 @@
+import numpy as np
+
+
+def expand_ranges(starts, ends):
+    # Every (i, j) with starts[i] <= j < ends[i], as two flat index arrays
+    counts = np.maximum(ends - starts, 0)
+    first = np.repeat(np.arange(len(starts)), counts)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    second = np.repeat(starts, counts) + offsets
+    return first, second
+
+
+def aabbs_overlap(min_a, max_a, min_b, max_b):
+    # Touching boxes count as overlapping, like check_object_collision
+    return np.all((max_a >= min_b) & (min_a <= max_b), axis=-1)
+
+
+def sort_pairs(first, second):
+    # (low, high) pairs in the order of the brute-force i < j loop
+    low = np.minimum(first, second)
+    high = np.maximum(first, second)
+    order = np.lexsort((high, low))
+    return np.stack([low[order], high[order]], axis=1)
+
+
+def hash_cells(cells):
+    # (N, 3) integer grid cells to int64 keys; collisions only add candidates
+    return (cells[:, 0] * 73856093) ^ (cells[:, 1] * 19349663) ^ (cells[:, 2] * 83492791)
+
+
+def subset_aabbs(world, rows, aabbs=None):
+    # AABBs of the ascending body indices `rows`, all bodies for None;
+    # aabbs replaces the world's boxes with other (mins, maxs) per body
+    mins, maxs = world.get_aabbs() if aabbs is None else aabbs
+    if rows is None:
+        return mins, maxs
+    return mins[rows], maxs[rows]
+
+
+def subset_pairs(pairs, rows):
+    # Local pair indices back to body indices; ascending rows keep the order
+    return pairs if rows is None else rows[pairs]
+
+
+class BruteForceBroadphase:
+    def find_pairs(self, world, rows=None, aabbs=None):
+        mins, maxs = subset_aabbs(world, rows, aabbs)
+        first, second = np.triu_indices(len(mins), 1)
+        hit = aabbs_overlap(mins[first], maxs[first], mins[second], maxs[second])
+        return subset_pairs(sort_pairs(first[hit], second[hit]), rows)
+
+
+class SweepAndPrune:
+    def __init__(self, axis=None):
+        # None sweeps along the axis the AABB minimums spread out most on
+        self.axis = axis
+        # Body indices sorted by AABB minimum on `axis`, kept between frames
+        self.order = np.empty(0, dtype=np.intp)
+
+    def _sync_order(self, count):
+        if len(self.order) == count:
+            return
+        known = self.order[self.order < count]
+        added = np.setdiff1d(np.arange(count), known, assume_unique=True)
+        self.order = np.concatenate([known, added])
+
+    def find_pairs(self, world, rows=None, aabbs=None):
+        mins, maxs = subset_aabbs(world, rows, aabbs)
+        n = len(mins)
+        axis = self.axis
+        if axis is None:
+            axis = int(np.argmax(mins.var(axis=0))) if n else 0
+        if rows is None:
+            self._sync_order(n)
+            # Bodies barely move between frames, so the previous order is
+            # almost sorted and the stable sort (timsort) runs in close to
+            # linear time
+            order = self.order
+            order = order[np.argsort(mins[order, axis], kind="stable")]
+            self.order = order
+        else:
+            # Subsets change from call to call, sort them from scratch
+            order = np.argsort(mins[:, axis], kind="stable")
+
+        sorted_min = mins[order, axis]
+        sorted_max = maxs[order, axis]
+        ends = np.searchsorted(sorted_min, sorted_max, side="right")
+        first, second = expand_ranges(np.arange(1, n + 1), ends)
+        first, second = order[first], order[second]
+
+        hit = aabbs_overlap(mins[first], maxs[first], mins[second], maxs[second])
+        return subset_pairs(sort_pairs(first[hit], second[hit]), rows)
+
+
+class SpatialHashGrid:
+    def __init__(self, cell_size=None):
+        # None picks the median body extent on every query
+        self.cell_size = cell_size
+
+    @staticmethod
+    def auto_cell_size(world):
+        n = world.count
+        if n == 0:
+            return 1.0
+        extents = (world.bb_max[:n] - world.bb_min[:n]).max(axis=1)
+        size = float(np.median(extents))
+        return size if size > 0 else 1.0
+
+    def find_pairs(self, world, rows=None, aabbs=None):
+        mins, maxs = subset_aabbs(world, rows, aabbs)
+        n = len(mins)
+        cell_size = self.cell_size or self.auto_cell_size(world)
+
+        # Bin every body into each cell its AABB touches
+        low_cell = np.floor(mins / cell_size).astype(np.int64)
+        span = np.floor(maxs / cell_size).astype(np.int64) - low_cell + 1
+        counts = span.prod(axis=1)
+        body = np.repeat(np.arange(n), counts)
+        local = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        span_x, span_y = span[body, 0], span[body, 1]
+        cells = low_cell[body] + np.stack(
+            [local % span_x, (local // span_x) % span_y, local // (span_x * span_y)],
+            axis=1,
+        )
+        keys = hash_cells(cells)
+
+        # Pair up entries sharing a key; hash collisions only add candidates
+        order = np.argsort(keys, kind="stable")
+        keys, body = keys[order], body[order]
+        ends = np.searchsorted(keys, keys, side="right")
+        first, second = expand_ranges(np.arange(1, len(keys) + 1), ends)
+        first, second = body[first], body[second]
+
+        distinct = first != second
+        low = np.minimum(first[distinct], second[distinct])
+        high = np.maximum(first[distinct], second[distinct])
+        codes = np.unique(low * n + high)
+        low, high = codes // n, codes % n
+
+        hit = aabbs_overlap(mins[low], maxs[low], mins[high], maxs[high])
+        return subset_pairs(np.stack([low[hit], high[hit]], axis=1), rows)
+
+
+# Names scene files and command lines use to pick a broadphase
+BROADPHASES = {"brute": BruteForceBroadphase, "sap": SweepAndPrune, "grid": SpatialHashGrid}
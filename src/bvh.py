@@ -0,0 +1,102 @@
+import numpy as np
+
+from broadphase import aabbs_overlap, expand_ranges
+
+
+class StaticBVH:
+    def __init__(self, leaf_size=4):
+        self.leaf_size = leaf_size
+        self.dirty = True
+        self.build(np.zeros((0, 3)), np.zeros((0, 3)))
+
+    def mark_dirty(self):
+        self.dirty = True
+
+    def build(self, mins, maxs):
+        mins = np.asarray(mins, dtype=float).reshape(-1, 3)
+        maxs = np.asarray(maxs, dtype=float).reshape(-1, 3)
+        self.mins, self.maxs = mins, maxs
+        self.items = np.arange(len(mins))
+        centers = mins + maxs
+
+        # Built a level at a time: every node of one depth is split by the
+        # same few numpy calls, at the median along the longest axis of its
+        # centroids. Nodes are numbered breadth first.
+        starts, counts, lefts, rights = [], [], [], []
+        start, count = np.array([0]), np.array([len(mins)])
+        next_node = 1
+        while len(start):
+            split = count > self.leaf_size
+            left = np.full(len(start), -1)
+            left[split] = next_node + 2 * np.arange(split.sum())
+            starts.append(start)
+            counts.append(count)
+            lefts.append(left)
+            rights.append(np.where(split, left + 1, -1))
+            next_node += 2 * split.sum()
+
+            start, count = start[split], count[split]
+            if not len(start):
+                break
+            node, position = expand_ranges(start, start + count)
+            items = self.items[position]
+            offsets = np.cumsum(count) - count
+            extent = np.maximum.reduceat(centers[items], offsets) - np.minimum.reduceat(
+                centers[items], offsets
+            )
+            key = centers[items, np.argmax(extent, axis=1)[node]]
+            self.items[position] = items[np.lexsort((key, node))]
+            middle = count // 2
+            start = np.stack([start, start + middle], axis=1).ravel()
+            count = np.stack([middle, count - middle], axis=1).ravel()
+
+        self.start = np.concatenate(starts)
+        self.count = np.concatenate(counts)
+        self.left = np.concatenate(lefts)
+        self.right = np.concatenate(rights)
+        self.node_min = np.zeros((len(self.start), 3))
+        self.node_max = np.zeros((len(self.start), 3))
+        filled = self.count > 0
+        if filled.any():
+            start, count = self.start[filled], self.count[filled]
+            _, position = expand_ranges(start, start + count)
+            offsets = np.cumsum(count) - count
+            self.node_min[filled] = np.minimum.reduceat(mins[self.items[position]], offsets)
+            self.node_max[filled] = np.maximum.reduceat(maxs[self.items[position]], offsets)
+        self.dirty = False
+
+    def query(self, mins, maxs):
+        # (item, box) index pairs for every overlap between the tree's items
+        # and the query boxes, ordered by item then box
+        found_items, found_boxes = [], []
+        boxes = np.arange(len(mins))
+        nodes = np.zeros(len(mins), dtype=int)
+        while len(boxes) and len(self.items):
+            hit = aabbs_overlap(
+                self.node_min[nodes], self.node_max[nodes], mins[boxes], maxs[boxes]
+            )
+            boxes, nodes = boxes[hit], nodes[hit]
+
+            leaf = self.left[nodes] < 0
+            leaf_boxes, leaf_nodes = boxes[leaf], nodes[leaf]
+            first, second = expand_ranges(
+                self.start[leaf_nodes], self.start[leaf_nodes] + self.count[leaf_nodes]
+            )
+            items, candidates = self.items[second], leaf_boxes[first]
+            hit = aabbs_overlap(
+                self.mins[items], self.maxs[items], mins[candidates], maxs[candidates]
+            )
+            found_items.append(items[hit])
+            found_boxes.append(candidates[hit])
+
+            inner = ~leaf
+            boxes = np.repeat(boxes[inner], 2)
+            nodes = np.stack([self.left[nodes[inner]], self.right[nodes[inner]]], axis=1)
+            nodes = nodes.ravel()
+
+        if not found_items:
+            return np.empty((0, 2), dtype=int)
+        items = np.concatenate(found_items)
+        boxes = np.concatenate(found_boxes)
+        order = np.lexsort((boxes, items))
+        return np.stack([items[order], boxes[order]], axis=1)
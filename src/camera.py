@@ -1,11 +1,15 @@
 import numpy as np
 from OpenGL.GLU import gluLookAt
 
+from frustum import look_at_matrix
+
 
 class Camera:
     def __init__(self, offset=(0, 2, 6)):
         self.offset = np.array(offset, dtype=float)
         self.position = np.array([0.0, 0.5, 0.0], dtype=float)
+        self.eye = self.position + self.offset
+        self.view_matrix = look_at_matrix(self.eye, self.position)
         self.yaw = 0.0
 
     def update(self, keymap, position, yaw):
@@ -21,6 +25,8 @@ class Camera:
         cam_x = self.position[0] - self.offset[2] * sin_yaw
         cam_y = self.position[1] + self.offset[1]
         cam_z = self.position[2] - self.offset[2] * cos_yaw
+        self.eye = np.array([cam_x, cam_y, cam_z])
+        self.view_matrix = look_at_matrix(self.eye, self.position)
 
         gluLookAt(
             cam_x,
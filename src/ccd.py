@@ -0,0 +1,194 @@
+import numpy as np
+
+from broadphase import aabbs_overlap, expand_ranges, hash_cells
+
+
+def swept_toi(origin, displacement, target_min, target_max):
+    # Slab test of the segment origin + t * displacement, t in (0, 1], against
+    # boxes already grown by the moving box (Minkowski sum). Returns the entry
+    # time (inf for a miss) and the axis of the face that was hit.
+    origin = np.asarray(origin, dtype=float).reshape(-1, 3)
+    displacement = np.asarray(displacement, dtype=float).reshape(-1, 3)
+    still = displacement == 0
+    inside = (origin >= target_min) & (origin <= target_max)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        first = (target_min - origin) / displacement
+        second = (target_max - origin) / displacement
+    near = np.where(still, np.where(inside, -np.inf, np.inf), np.minimum(first, second))
+    far = np.where(still, np.where(inside, np.inf, -np.inf), np.maximum(first, second))
+
+    axis = np.argmax(near, axis=1)
+    enter, leave = near.max(axis=1), far.min(axis=1)
+    # Boxes overlapping at the start are left to the discrete pass
+    hit = (enter <= leave) & (enter > 0) & (enter <= 1)
+    return np.where(hit, enter, np.inf), axis
+
+
+def fast_rows(world, start, fraction=0.5):
+    # Bodies that moved further this step than `fraction` of their thinnest
+    # box extent; the rest cannot tunnel and keep the discrete path only
+    n = world.count
+    moved = np.linalg.norm(world.position[:n] - start, axis=1)
+    extent = (world.bb_max[:n] - world.bb_min[:n]).min(axis=1)
+    return np.flatnonzero(moved > fraction * extent)
+
+
+def shape_impacts(world, start, rows, bvh):
+    # Earliest impact of each fast body with a static shape:
+    # (rows, times, axes, shapes) for the bodies that hit one
+    displacement = world.position[rows] - start[rows]
+    box_min, box_max = world.bb_min[rows], world.bb_max[rows]
+    end = start[rows] + displacement
+    swept_min = np.minimum(start[rows], end) + box_min
+    swept_max = np.maximum(start[rows], end) + box_max
+    pairs = bvh.query(swept_min, swept_max)
+    shapes, fast = pairs[:, 0], pairs[:, 1]
+
+    times, axes = swept_toi(
+        start[rows][fast],
+        displacement[fast],
+        bvh.mins[shapes] - box_max[fast],
+        bvh.maxs[shapes] - box_min[fast],
+    )
+    return earliest(rows[fast], times, axes, shapes)
+
+
+def swept_pairs(swept_min, swept_max, rows):
+    # (fast, other) rows whose swept boxes overlap, ordered by fast then
+    # other, two fast bodies from the lower row
+    n = len(swept_min)
+    is_fast = np.zeros(n, dtype=bool)
+    is_fast[rows] = True
+    slow = np.flatnonzero(~is_fast)
+    fast, other = slow_candidates(swept_min, swept_max, rows, slow)
+
+    # Fast bodies against each other: a sweep along the widest spread axis
+    axis = int(np.argmax(swept_min[rows].var(axis=0))) if len(rows) else 0
+    order = rows[np.argsort(swept_min[rows, axis], kind="stable")]
+    ends = np.searchsorted(swept_min[order, axis], swept_max[order, axis], side="right")
+    first, second = expand_ranges(np.arange(1, len(rows) + 1), ends)
+    first, second = order[first], order[second]
+
+    codes = np.unique(
+        np.concatenate([fast * n + other, np.minimum(first, second) * n + np.maximum(first, second)])
+    )
+    fast, other = codes // n, codes % n
+    keep = aabbs_overlap(swept_min[fast], swept_max[fast], swept_min[other], swept_max[other])
+    return fast[keep], other[keep]
+
+
+def slow_candidates(swept_min, swept_max, rows, slow):
+    # Slow bodies are binned by the grid cell of their swept minimum, with
+    # cells as large as the largest slow box; a slow box overlapping a fast
+    # one then starts in a cell from one below the fast box's first cell to
+    # its last. Fast boxes spanning more cells than there are slow bodies
+    # are paired with every slow body instead.
+    empty = np.empty(0, dtype=int)
+    if not len(rows) or not len(slow):
+        return empty, empty
+    cell_size = float((swept_max[slow] - swept_min[slow]).max()) or 1.0
+    keys = hash_cells(np.floor(swept_min[slow] / cell_size).astype(np.int64))
+    order = np.argsort(keys, kind="stable")
+    keys, slow = keys[order], slow[order]
+
+    low = np.floor(swept_min[rows] / cell_size).astype(np.int64) - 1
+    span = np.floor(swept_max[rows] / cell_size).astype(np.int64) - low + 1
+    counts = span.prod(axis=1)
+    wide = counts > len(slow)
+    counts[wide] = 0
+    body = np.repeat(np.arange(len(rows)), counts)
+    local = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    span_x, span_y = span[body, 0], span[body, 1]
+    cells = low[body] + np.stack(
+        [local % span_x, (local // span_x) % span_y, local // (span_x * span_y)], axis=1
+    )
+    query = hash_cells(cells)
+    first, second = expand_ranges(
+        np.searchsorted(keys, query, side="left"), np.searchsorted(keys, query, side="right")
+    )
+    fast, other = rows[body[first]], slow[second]
+
+    wide_fast, wide_other = expand_ranges(np.zeros(wide.sum(), dtype=int), np.full(wide.sum(), len(slow)))
+    return (
+        np.concatenate([fast, rows[wide][wide_fast]]),
+        np.concatenate([other, slow[wide_other]]),
+    )
+
+
+def body_impacts(world, start, rows):
+    # Earliest impact of each fast body with any other body, both moving
+    # linearly over the step: (rows, times, axes, others)
+    n = world.count
+    end = world.position[:n]
+    swept_min = np.minimum(start, end) + world.bb_min[:n]
+    swept_max = np.maximum(start, end) + world.bb_max[:n]
+    fast, other = swept_pairs(swept_min, swept_max, rows)
+
+    displacement = (end[fast] - start[fast]) - (end[other] - start[other])
+    times, axes = swept_toi(
+        start[fast],
+        displacement,
+        start[other] + world.bb_min[other] - world.bb_max[fast],
+        start[other] + world.bb_max[other] - world.bb_min[fast],
+    )
+    return earliest(fast, times, axes, other)
+
+
+def earliest(rows, times, axes, targets):
+    # First hit per row, ties going to the earlier candidate
+    hit = np.isfinite(times)
+    rows, times, axes, targets = rows[hit], times[hit], axes[hit], targets[hit]
+    order = np.lexsort((times, rows))
+    rows, times, axes, targets = rows[order], times[order], axes[order], targets[order]
+    first = np.ones(len(rows), dtype=bool)
+    first[1:] = rows[1:] != rows[:-1]
+    return rows[first], times[first], axes[first], targets[first]
+
+
+def resolve_fast_motion(world, start, bvh=None, fraction=0.5, skin=1e-4):
+    # Continuous collision for bodies that moved far enough to tunnel.
+    # `start` holds every body's position before world.step. Impacts are
+    # handled earliest first and each body at most once per step: it stops
+    # `skin` short of the contact and responds like the discrete passes
+    # (bounce off shapes, swap velocities with bodies).
+    start = start[: world.count]
+    rows = fast_rows(world, start, fraction)
+    if len(rows) == 0:
+        return 0
+
+    events = []
+    if bvh is not None and len(bvh.items):
+        for body, time, axis, shape in zip(*(x.tolist() for x in shape_impacts(world, start, rows, bvh))):
+            events.append((time, body, axis, -1, shape))
+    for body, time, axis, other in zip(*(x.tolist() for x in body_impacts(world, start, rows))):
+        events.append((time, body, axis, other, -1))
+    events.sort(key=lambda event: event[0])
+
+    position, velocity = world.position, world.velocity
+    handled = set()
+    for time, body, axis, other, shape in events:
+        if body in handled or other in handled:
+            continue
+        moved = position[body] - start[body]
+        if other < 0:
+            contact = start[body] + moved * time
+            if moved[axis] > 0:
+                contact[axis] = bvh.mins[shape, axis] - world.bb_max[body, axis] - skin
+            else:
+                contact[axis] = bvh.maxs[shape, axis] - world.bb_min[body, axis] + skin
+            position[body] = contact
+            if velocity[body, axis] * moved[axis] > 0:
+                velocity[body, axis] = -velocity[body, axis] * world.bounciness[body]
+            handled.add(body)
+            continue
+
+        other_moved = position[other] - start[other]
+        sign = 1.0 if moved[axis] - other_moved[axis] > 0 else -1.0
+        position[body] = start[body] + moved * time
+        position[other] = start[other] + other_moved * time
+        position[body, axis] -= sign * skin / 2
+        position[other, axis] += sign * skin / 2
+        velocity[[body, other]] = velocity[[other, body]]
+        world.wake([body, other])
+        handled.update((body, other))
+    return len(handled)
@@ -1,21 +1,88 @@
 from object_3d import Object3D
 from rigid_body_3d import RigidBody3D
+from bvh import StaticBVH
+from narrowphase import resolve_shape_contacts
 import numpy as np
 
 
 class CollisionShape(Object3D):
     instances = []
+    # Shapes are static, the tree is only rebuilt when the set changes
+    bvh = StaticBVH()
+    positions = np.zeros((0, 3))
 
     def __init__(self, position=None, bounding_box_size=None):
         self.instances.append(self)
         super().__init__(position, bounding_box_size)
+        CollisionShape.bvh.mark_dirty()
 
     @staticmethod
-    def check_all_collisions_with_rigidbody():
-        for shape in CollisionShape.instances:
-            for rigidbody in RigidBody3D.instances:
-                shape.check_collision_with_rigidbody(rigidbody)
-            shape.draw_bounding_box()
+    def create_many(positions, bb_mins, bb_maxs):
+        # Bulk constructor, the tree is marked dirty once for the whole batch.
+        # Every shape gets its own writable rows, like Object3D's arrays,
+        # even when one value is broadcast to the whole batch.
+        positions = np.array(positions, dtype=float).reshape(-1, 3)
+        bb_mins = np.array(np.broadcast_to(np.asarray(bb_mins, dtype=float), positions.shape))
+        bb_maxs = np.array(np.broadcast_to(np.asarray(bb_maxs, dtype=float), positions.shape))
+        shapes = []
+        for position, bb_min, bb_max in zip(positions, bb_mins, bb_maxs):
+            shape = CollisionShape.__new__(CollisionShape)
+            shape.position = position
+            shape.bounding_box_size = [bb_min, bb_max]
+            shapes.append(shape)
+        CollisionShape.instances.extend(shapes)
+        CollisionShape.bvh.mark_dirty()
+        return shapes
+
+    def remove(self):
+        CollisionShape.instances.remove(self)
+        CollisionShape.bvh.mark_dirty()
+
+    def set_position(self, position):
+        super().set_position(position)
+        CollisionShape.bvh.mark_dirty()
+
+    @staticmethod
+    def get_aabbs():
+        aabbs = [shape.get_aabb() for shape in CollisionShape.instances]
+        mins = np.array([min_bb for min_bb, _ in aabbs], dtype=float).reshape(-1, 3)
+        maxs = np.array([max_bb for _, max_bb in aabbs], dtype=float).reshape(-1, 3)
+        return mins, maxs
+
+    @staticmethod
+    def rebuild_bvh():
+        CollisionShape.positions = np.array(
+            [shape.position for shape in CollisionShape.instances], dtype=float
+        ).reshape(-1, 3)
+        CollisionShape.bvh.build(*CollisionShape.get_aabbs())
+
+    @staticmethod
+    def check_all_collisions_with_rigidbody(rows=None):
+        bvh = CollisionShape.bvh
+        if bvh.dirty:
+            CollisionShape.rebuild_bvh()
+        world = RigidBody3D.world
+        # Sleeping bodies stay where the last contact left them
+        awake = world.awake_rows() if rows is None else rows[world.awake[rows]]
+        mins, maxs = world.get_aabbs()
+        pairs = bvh.query(mins[awake], maxs[awake])
+        pairs[:, 1] = np.arange(world.count)[awake][pairs[:, 1]]
+        resolve_shape_contacts(
+            world, CollisionShape.positions, bvh.mins, bvh.maxs, pairs, RigidBody3D.solver
+        )
+
+    @staticmethod
+    def draw_all_bounding_boxes(frustum=None):
+        shapes = CollisionShape.instances
+        if frustum is None:
+            for shape in shapes:
+                shape.draw_bounding_box()
+            return
+        if CollisionShape.bvh.dirty:
+            CollisionShape.rebuild_bvh()
+        bvh = CollisionShape.bvh
+        for i in frustum.visible_rows(bvh.mins, bvh.maxs):
+            shapes[i].draw_bounding_box()
 
     def get_aabb(self):
         min_bb = self.position + self.bounding_box_size[0]
@@ -36,11 +103,11 @@ class CollisionShape(Object3D):
             axis = np.argmin(diffs)
             if rigidbody.position[axis] < self.position[axis]:
                 rigidbody.position[axis] = (
-                    min_a[axis] - rigidbody.bounding_box_size[1]
+                    min_a[axis] - rigidbody.bounding_box_size[1][axis]
                 )
             else:
                 rigidbody.position[axis] = (
-                    max_a[axis] - rigidbody.bounding_box_size[0]
+                    max_a[axis] - rigidbody.bounding_box_size[0][axis]
                 )
 
             rigidbody.velocity[axis] = -rigidbody.velocity[axis] * getattr(rigidbody, "bounciness", 0.0)
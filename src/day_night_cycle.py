@@ -1,99 +1,178 @@
-import pygame
-from OpenGL.GL import *
-from OpenGL.GLU import *
-from math import sin, cos, radians, pi
-import random
+from math import sin, cos, pi
+from functools import lru_cache
+
+import numpy as np
+
+# OpenGL is only imported by the drawing methods, so the cycle and its
+# tables also work headless (scene loading, replay, benchmarks)
+
+# Columns of a cycle table row
+SKY_COLOR = slice(0, 3)
+SUN_POSITION = slice(3, 6)
+MOON_POSITION = slice(6, 9)
+SUN_INTENSITY = 9
+MOON_INTENSITY = 10
+
+
+def is_daytime_at(time_of_day):
+    return 6 < time_of_day < 18
+
+
+def sky_color_at(time_of_day):
+    if is_daytime_at(time_of_day):
+        progress = (time_of_day - 6) / 12
+        if time_of_day < 12:
+            return (0.3 + 0.2 * progress, 0.5 + 0.2 * progress, 0.8 + 0.2 * progress)
+        else:
+            return (0.5 - 0.2 * (progress-0.5), 0.7 - 0.2 * (progress-0.5), 1.0 - 0.3 * (progress-0.5))
+    else:
+        progress = (time_of_day - 18) / 12 if time_of_day > 18 else (time_of_day + 6) / 12
+        darkness = 0.1 + 0.9 * (1 - abs(progress - 0.5) * 2)
+        return (0.05 * darkness, 0.05 * darkness, 0.15 * darkness)
+
+
+def sun_position_at(time_of_day):
+    sun_angle = (time_of_day / 24) * 2 * pi - pi/2
+    sun_distance = 20
+    return (
+        sun_distance * cos(sun_angle),
+        max(0, sun_distance * sin(sun_angle)),
+        sun_distance * 0.5
+    )
+
+
+def moon_position_at(time_of_day):
+    moon_angle = (time_of_day / 24) * 2 * pi + pi/2
+    moon_distance = 20
+    return (
+        moon_distance * cos(moon_angle),
+        max(0, moon_distance * sin(moon_angle)),
+        moon_distance * 0.5
+    )
+
+
+def sun_intensity_at(time_of_day):
+    return max(0.2, sin(pi * (time_of_day - 6)/12))
+
+
+def moon_intensity_at(time_of_day):
+    return max(0.1, 0.3 * sin(pi * (time_of_day - 18)/12))
+
+
+@lru_cache(maxsize=None)
+def build_cycle_table(resolution=1440):
+    # resolution + 1 rows covering 0..24 h, shared by every cycle that asks
+    # for the same resolution
+    rows = [
+        sky_color_at(hour) + sun_position_at(hour) + moon_position_at(hour)
+        + (sun_intensity_at(hour), moon_intensity_at(hour))
+        for hour in np.linspace(0, 24, resolution + 1)
+    ]
+    table = np.array(rows)
+    table.flags.writeable = False
+    return table
+
+
+def sample_cycle_table(table, time_of_day):
+    # Linear interpolation between the two rows around time_of_day
+    position = (time_of_day % 24) / 24 * (len(table) - 1)
+    index = min(int(position), len(table) - 2)
+    fraction = position - index
+    return table[index] * (1 - fraction) + table[index + 1] * fraction
+
 
 class DayNightCycle:
-    def __init__(self):
+    def __init__(self, table_resolution=1440):
         self.time_of_day = 12.0  # Jam mulai pukul 12.00 siang
         self.day_speed = 0.05    # Kecepatan waktu (jam per detik realtime)
         self.is_daytime = True   # Status siang/malam
+        self.table = build_cycle_table(table_resolution)
+        self.state = None
+        self.state_time = None
+        self.light_state = None
     
     def update(self, dt):
         self.time_of_day = (self.time_of_day + self.day_speed * dt) % 24
-        self.is_daytime = 6 < self.time_of_day < 18
+        self.is_daytime = is_daytime_at(self.time_of_day)
+
+    def get_state(self):
+        # Sampled once per time of day, however many viewports ask
+        if self.state_time != self.time_of_day:
+            self.state = sample_cycle_table(self.table, self.time_of_day)
+            self.state_time = self.time_of_day
+        return self.state
     
     def get_sky_color(self):
-        if self.is_daytime:
-            progress = (self.time_of_day - 6) / 12
-            if self.time_of_day < 12:
-                return (0.3 + 0.2 * progress, 0.5 + 0.2 * progress, 0.8 + 0.2 * progress)
-            else:
-                return (0.5 - 0.2 * (progress-0.5), 0.7 - 0.2 * (progress-0.5), 1.0 - 0.3 * (progress-0.5))
-        else:
-            progress = (self.time_of_day - 18) / 12 if self.time_of_day > 18 else (self.time_of_day + 6) / 12
-            darkness = 0.1 + 0.9 * (1 - abs(progress - 0.5) * 2)
-            return (0.05 * darkness, 0.05 * darkness, 0.15 * darkness)
+        return tuple(self.get_state()[SKY_COLOR])
     
     def get_sun_position(self):
-        sun_angle = (self.time_of_day / 24) * 2 * pi - pi/2
-        sun_distance = 20
-        return (
-            sun_distance * cos(sun_angle),
-            max(0, sun_distance * sin(sun_angle)),
-            sun_distance * 0.5
-        )
+        return tuple(self.get_state()[SUN_POSITION])
     
     def get_moon_position(self):
-        moon_angle = (self.time_of_day / 24) * 2 * pi + pi/2
-        moon_distance = 20
-        return (
-            moon_distance * cos(moon_angle),
-            max(0, moon_distance * sin(moon_angle)),
-            moon_distance * 0.5
-        )
+        return tuple(self.get_state()[MOON_POSITION])
     
     def setup_lighting(self):
+        from OpenGL.GL import (
+            GL_AMBIENT,
+            GL_COLOR_MATERIAL,
+            GL_DIFFUSE,
+            GL_LIGHT0,
+            GL_LIGHT1,
+            GL_LIGHTING,
+            GL_POSITION,
+            glDisable,
+            glEnable,
+            glLightfv,
+        )
+
         glEnable(GL_LIGHTING)
         glEnable(GL_COLOR_MATERIAL)
+
+        state = self.get_state()
+        sun_intensity = state[SUN_INTENSITY]
+        moon_intensity = state[MOON_INTENSITY]
+        # Light colors only go back to GL once they move by a visible step
+        light_state = (self.is_daytime, round(sun_intensity * 255), round(moon_intensity * 255))
+        changed = light_state != self.light_state
+        self.light_state = light_state
         
-        # Matahari
-        sun_pos = self.get_sun_position()
+        # Matahari. GL_POSITION is sent every frame because GL transforms it
+        # by the current modelview matrix
         if self.is_daytime:
-            sun_intensity = max(0.2, sin(pi * (self.time_of_day - 6)/12))
+            sun_pos = state[SUN_POSITION]
             glLightfv(GL_LIGHT0, GL_POSITION, [sun_pos[0], sun_pos[1], sun_pos[2], 1.0])
-            glLightfv(GL_LIGHT0, GL_DIFFUSE, [sun_intensity, sun_intensity, sun_intensity, 1.0])
-            glLightfv(GL_LIGHT0, GL_AMBIENT, [0.2, 0.2, 0.2, 1.0])
-            glEnable(GL_LIGHT0)
-        else:
+            if changed:
+                glLightfv(GL_LIGHT0, GL_DIFFUSE, [sun_intensity, sun_intensity, sun_intensity, 1.0])
+                glLightfv(GL_LIGHT0, GL_AMBIENT, [0.2, 0.2, 0.2, 1.0])
+                glEnable(GL_LIGHT0)
+        elif changed:
             glDisable(GL_LIGHT0)
         
         # Bulan
-        moon_pos = self.get_moon_position()
         if not self.is_daytime:
-            moon_intensity = max(0.1, 0.3 * sin(pi * (self.time_of_day - 18)/12))
+            moon_pos = state[MOON_POSITION]
             glLightfv(GL_LIGHT1, GL_POSITION, [moon_pos[0], moon_pos[1], moon_pos[2], 1.0])
-            glLightfv(GL_LIGHT1, GL_DIFFUSE, [moon_intensity*0.7, moon_intensity*0.7, moon_intensity, 1.0])
-            glLightfv(GL_LIGHT1, GL_AMBIENT, [0.05, 0.05, 0.1, 1.0])
-            glEnable(GL_LIGHT1)
-        else:
+            if changed:
+                glLightfv(GL_LIGHT1, GL_DIFFUSE, [moon_intensity*0.7, moon_intensity*0.7, moon_intensity, 1.0])
+                glLightfv(GL_LIGHT1, GL_AMBIENT, [0.05, 0.05, 0.1, 1.0])
+                glEnable(GL_LIGHT1)
+        elif changed:
             glDisable(GL_LIGHT1)
     
-    def draw_sky_objects(self):
-        sun_pos = self.get_sun_position()
-        moon_pos = self.get_moon_position()
-        
-        glPushMatrix()
-        glDisable(GL_LIGHTING)
-        
-        if sun_pos[1] > 0:
-            glTranslatef(*sun_pos)
-            glColor3f(1, 0.9, 0)
-            glutSolidSphere(1.0, 16, 16)
-        
-        if moon_pos[1] > 0:
-            glTranslatef(moon_pos[0]-sun_pos[0], moon_pos[1]-sun_pos[1], moon_pos[2]-sun_pos[2])
-            glColor3f(0.8, 0.8, 0.9)
-            glutSolidSphere(0.8, 16, 16)
-        
-        glEnable(GL_LIGHTING)
-        glPopMatrix()
-    
     def get_time_text(self):
         return f"{int(self.time_of_day):02d}:{int((self.time_of_day%1)*60):02d} {'AM' if self.time_of_day < 12 else 'PM'}"
     
-    def draw_sky_objects(self):
+    def draw_sky_objects(self, lod=None, eye=None, fovy=45.0, viewport_height=600):
+        from OpenGL.GL import (
+            GL_LIGHTING,
+            glColor3f,
+            glDisable,
+            glEnable,
+            glPopMatrix,
+            glPushMatrix,
+            glTranslatef,
+        )
+
         sun_pos = self.get_sun_position()
         moon_pos = self.get_moon_position()
         
@@ -103,16 +182,27 @@ class DayNightCycle:
         if sun_pos[1] > 0:
             glTranslatef(*sun_pos)
             glColor3f(1, 0.9, 0)
-            quadric = gluNewQuadric()
-            gluSphere(quadric, 1.0, 16, 16)
-            gluDeleteQuadric(quadric)
+            self.draw_sphere(1.0, sun_pos, lod, eye, fovy, viewport_height)
         
         if moon_pos[1] > 0:
             glTranslatef(moon_pos[0]-sun_pos[0], moon_pos[1]-sun_pos[1], moon_pos[2]-sun_pos[2])
             glColor3f(0.8, 0.8, 0.9)
-            quadric = gluNewQuadric()
-            gluSphere(quadric, 0.8, 16, 16)
-            gluDeleteQuadric(quadric)
+            self.draw_sphere(0.8, moon_pos, lod, eye, fovy, viewport_height)
         
         glEnable(GL_LIGHTING)
-        glPopMatrix()
\ No newline at end of file
+        glPopMatrix()
+
+    def draw_sphere(self, radius, position, lod, eye, fovy, viewport_height):
+        from OpenGL.GL import glPopMatrix, glPushMatrix, glScalef
+        from OpenGL.GLU import gluDeleteQuadric, gluNewQuadric, gluSphere
+
+        if lod is None or eye is None:
+            quadric = gluNewQuadric()
+            gluSphere(quadric, radius, 16, 16)
+            gluDeleteQuadric(quadric)
+            return
+        level = lod.select([position], [radius], eye, fovy, viewport_height)[0]
+        glPushMatrix()
+        glScalef(radius, radius, radius)
+        lod.draw_sphere(level)
+        glPopMatrix()
@@ -0,0 +1,22 @@
+class FixedStepScheduler:
+    def __init__(self, step_dt=1 / 120, max_substeps=8):
+        self.step_dt = step_dt
+        self.max_substeps = max_substeps
+        self.accumulator = 0.0
+
+    def advance(self, frame_dt, step):
+        # Run step(step_dt) as many times as the elapsed frame time allows
+        self.accumulator += frame_dt
+        steps = 0
+        while self.accumulator >= self.step_dt and steps < self.max_substeps:
+            step(self.step_dt)
+            self.accumulator -= self.step_dt
+            steps += 1
+        # After a long hitch drop the backlog instead of spiralling
+        self.accumulator = min(self.accumulator, self.step_dt)
+        return steps
+
+    @property
+    def alpha(self):
+        # Blend factor between the previous and the current physics state
+        return self.accumulator / self.step_dt
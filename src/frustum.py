@@ -0,0 +1,63 @@
+import numpy as np
+
+
+def perspective_matrix(fovy, aspect, near, far):
+    # Same matrix gluPerspective builds
+    f = 1.0 / np.tan(np.radians(fovy) / 2)
+    return np.array(
+        [
+            [f / aspect, 0, 0, 0],
+            [0, f, 0, 0],
+            [0, 0, (far + near) / (near - far), 2 * far * near / (near - far)],
+            [0, 0, -1, 0],
+        ]
+    )
+
+
+def look_at_matrix(eye, target, up=(0, 1, 0)):
+    # Same matrix gluLookAt builds
+    eye = np.asarray(eye, dtype=float)
+    forward = np.asarray(target, dtype=float) - eye
+    forward /= np.linalg.norm(forward)
+    side = np.cross(forward, up)
+    side /= np.linalg.norm(side)
+    up = np.cross(side, forward)
+    view = np.identity(4)
+    view[0, :3], view[1, :3], view[2, :3] = side, up, -forward
+    view[:3, 3] = -view[:3, :3] @ eye
+    return view
+
+
+def extract_planes(projection, view):
+    # Six (a, b, c, d) planes, normals pointing inside, from the rows of
+    # the clip matrix: left, right, bottom, top, near, far
+    clip = projection @ view
+    planes = np.array(
+        [
+            clip[3] + clip[0],
+            clip[3] - clip[0],
+            clip[3] + clip[1],
+            clip[3] - clip[1],
+            clip[3] + clip[2],
+            clip[3] - clip[2],
+        ]
+    )
+    return planes / np.linalg.norm(planes[:, :3], axis=1, keepdims=True)
+
+
+class Frustum:
+    def __init__(self, projection, view):
+        self.planes = extract_planes(projection, view)
+
+    def contains_aabbs(self, mins, maxs):
+        # A box is culled once its corner furthest along a plane normal is
+        # still behind that plane
+        mins = np.asarray(mins, dtype=float).reshape(-1, 3)
+        maxs = np.asarray(maxs, dtype=float).reshape(-1, 3)
+        normals, offsets = self.planes[:, :3], self.planes[:, 3]
+        corner = np.where(normals[None] >= 0, maxs[:, None], mins[:, None])
+        distance = np.einsum("npk,pk->np", corner, normals) + offsets
+        return np.all(distance >= 0, axis=1)
+
+    def visible_rows(self, mins, maxs):
+        return np.flatnonzero(self.contains_aabbs(mins, maxs))
@@ -0,0 +1,39 @@
+import ctypes
+
+from OpenGL.GL import *
+
+from mesh_builder import build_ground_mesh
+
+
+class GroundRenderer:
+    def __init__(self):
+        self.vbo = None
+        self.mesh_key = None
+        self.vertex_count = 0
+
+    def upload(self, size, tile_size):
+        vertices = build_ground_mesh(size, tile_size)
+        if self.vbo is None:
+            self.vbo = glGenBuffers(1)
+        glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
+        glBufferData(GL_ARRAY_BUFFER, vertices.nbytes, vertices, GL_STATIC_DRAW)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        self.mesh_key = (size, tile_size)
+        self.vertex_count = len(vertices)
+
+    def draw(self, size=20, tile_size=1):
+        if self.mesh_key != (size, tile_size):
+            self.upload(size, tile_size)
+
+        glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
+        glPushClientAttrib(GL_CLIENT_VERTEX_ARRAY_BIT)
+        glInterleavedArrays(GL_C3F_V3F, 0, ctypes.c_void_p(0))
+        glDrawArrays(GL_QUADS, 0, self.vertex_count)
+        glPopClientAttrib()
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+    def delete(self):
+        if self.vbo is not None:
+            glDeleteBuffers(1, [self.vbo])
+            self.vbo = None
+            self.mesh_key = None
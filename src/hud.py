@@ -4,24 +4,34 @@ from OpenGL.GLU import *
 from OpenGL.GLUT import *
 from math import cos, sin, radians
 
+from text_atlas import GlyphAtlas
+from texture_cache import TextureCache
+
 
 class HUD:
-    def __init__(self, display_size,):
+    def __init__(self, display_size, max_text_textures=64, max_text_bytes=8 * 1024 * 1024):
         self.display_size = display_size
-        self.textures = {}
-        self.font_cache = {}
+        self.font_cache = TextureCache(max_entries=8)
+        self.atlases = TextureCache(max_entries=4, on_evict=lambda size, atlas: atlas.delete())
+        # Whole-string textures for text the atlas has no glyphs for
+        self.textures = TextureCache(
+            max_text_textures, max_text_bytes, on_evict=lambda key, texture: glDeleteTextures([texture[0]])
+        )
         
     def get_font(self, size):
-        if size not in self.font_cache:
-            self.font_cache[size] = pygame.font.SysFont('Arial', size)
-        return self.font_cache[size]
+        return self.font_cache.get_or_create(size, lambda: (pygame.font.SysFont('Arial', size), 0))
 
-        
-    def draw_text(self, text, x, y, size=24, color=(255, 255, 255)):
-        key = (text, size, color)
-        if key not in self.textures:
-            font = self.get_font(size)
-            text_surface = font.render(text, True, color)
+    def get_atlas(self, size):
+        # One glyph texture per font size, whatever strings get drawn
+        def create():
+            atlas = GlyphAtlas(self.get_font(size))
+            return atlas, len(atlas.pixels)
+
+        return self.atlases.get_or_create(size, create)
+
+    def get_text_texture(self, text, size, color):
+        def create():
+            text_surface = self.get_font(size).render(text, True, color)
             text_data = pygame.image.tostring(text_surface, "RGBA", True)
             width, height = text_surface.get_size()
 
@@ -30,27 +40,28 @@ class HUD:
             glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA, width, height, 0, GL_RGBA, GL_UNSIGNED_BYTE, text_data)
             glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
             glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
+            return (texture_id, width, height), len(text_data)
 
-            self.textures[key] = (texture_id, width, height)
-        else:
-            texture_id, width, height = self.textures[key]
-            font = self.get_font(size)
-            text_surface = font.render(text, True, color)
-            text_data = pygame.image.tostring(text_surface, "RGBA", True)
-            width, height = text_surface.get_size()
+        return self.textures.get_or_create((text, size, color), create)
+
+    def cache_stats(self):
+        return {"atlases": self.atlases.stats(), "textures": self.textures.stats()}
+
+    def delete(self):
+        self.atlases.clear()
+        self.textures.clear()
+
+    def draw_text(self, text, x, y, size=24, color=(255, 255, 255)):
+        atlas = self.get_atlas(size)
+        texture = None
+        if not atlas.supports(text):
+            texture = self.get_text_texture(text, size, color)
 
         glDisable(GL_LIGHTING)
         glEnable(GL_TEXTURE_2D)
         glEnable(GL_BLEND)
         glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
 
-        # Generate texture
-        texture_id = glGenTextures(1)
-        glBindTexture(GL_TEXTURE_2D, texture_id)
-        glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA, width, height, 0, GL_RGBA, GL_UNSIGNED_BYTE, text_data)
-        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
-        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
-
         # Setup ortho 2D
         glMatrixMode(GL_PROJECTION)
         glPushMatrix()
@@ -61,14 +72,20 @@ class HUD:
         glPushMatrix()
         glLoadIdentity()
 
-        # Draw quad with texture
-        glBindTexture(GL_TEXTURE_2D, texture_id)
-        glBegin(GL_QUADS)
-        glTexCoord2f(0, 0); glVertex2f(x, y)
-        glTexCoord2f(1, 0); glVertex2f(x + width, y)
-        glTexCoord2f(1, 1); glVertex2f(x + width, y + height)
-        glTexCoord2f(0, 1); glVertex2f(x, y + height)
-        glEnd()
+        if texture is None:
+            # Glyphs are white in the atlas, tint them with the text color
+            glColor4ub(*color[:3], 255)
+            atlas.draw(text, x, y)
+        else:
+            texture_id, width, height = texture
+            glColor4ub(255, 255, 255, 255)
+            glBindTexture(GL_TEXTURE_2D, texture_id)
+            glBegin(GL_QUADS)
+            glTexCoord2f(0, 0); glVertex2f(x, y)
+            glTexCoord2f(1, 0); glVertex2f(x + width, y)
+            glTexCoord2f(1, 1); glVertex2f(x + width, y + height)
+            glTexCoord2f(0, 1); glVertex2f(x, y + height)
+            glEnd()
 
         # Clean up
         glPopMatrix()
@@ -76,7 +93,6 @@ class HUD:
         glPopMatrix()
         glMatrixMode(GL_MODELVIEW)
 
-        glDeleteTextures([texture_id])
         glDisable(GL_BLEND)
         glDisable(GL_TEXTURE_2D)
         glEnable(GL_LIGHTING)
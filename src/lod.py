@@ -0,0 +1,40 @@
+import numpy as np
+
+from mesh_builder import sphere_band_triangles
+
+
+def projected_diameter(positions, radii, eye, fovy=45.0, viewport_height=600):
+    # On-screen size in pixels of spheres seen through gluPerspective(fovy)
+    positions = np.asarray(positions, dtype=float).reshape(-1, 3)
+    distance = np.linalg.norm(positions - np.asarray(eye, dtype=float), axis=1)
+    distance = np.maximum(distance, 1e-6)
+    focal = viewport_height / (2 * np.tan(np.radians(fovy) / 2))
+    return 2 * np.asarray(radii, dtype=float) * focal / distance
+
+
+class SphereLOD:
+    # levels: (slices, stacks) from finest to coarsest; thresholds: the
+    # projected diameter in pixels a sphere needs to use each finer level
+    def __init__(self, levels=((32, 16), (16, 8), (8, 6)), thresholds=(60.0, 20.0)):
+        if len(thresholds) != len(levels) - 1:
+            raise ValueError("SphereLOD needs one threshold between each pair of levels")
+        self.levels = tuple(levels)
+        self.thresholds = np.asarray(thresholds, dtype=float)
+        self.meshes = [sphere_band_triangles(1.0, slices, stacks) for slices, stacks in levels]
+        self.buffers = None
+
+    def select(self, positions, radii, eye, fovy=45.0, viewport_height=600):
+        size = projected_diameter(positions, radii, eye, fovy, viewport_height)
+        return (size[:, None] < self.thresholds).sum(axis=1)
+
+    def get_buffers(self):
+        # Uploaded on first use so selection works without a GL context
+        if self.buffers is None:
+            from mesh_buffer import MeshBuffer
+
+            self.buffers = [MeshBuffer(vertices, normals) for vertices, normals in self.meshes]
+        return self.buffers
+
+    def draw_sphere(self, level):
+        # Unit sphere at the given level, the caller scales it
+        self.get_buffers()[level].draw(use_colors=False)
@@ -1,3 +1,6 @@
+import argparse
+import os
+
 import pygame
 from pygame.locals import *
 from OpenGL.GL import *
@@ -5,98 +8,93 @@ from OpenGL.GLU import *
 import numpy as np
 
 from r2d2_model import *
-from day_night_cycle import DayNightCycle
 from hud import HUD
 from camera import Camera
-from ball import Ball
 from rigid_body_3d import RigidBody3D
 from collision_shape import CollisionShape
+from adaptive_step import AdaptiveStepper
+from scene import DEFAULT_SCENE, load_scene
+from ground import GroundRenderer
+from mesh_builder import build_wall_quads
+from ball_renderer import BallRenderer
+from lod import SphereLOD
+from frustum import Frustum, perspective_matrix
+from profiler import FrameProfiler
+from replay import ReplayWriter
+from snapshot import load_snapshot, save_snapshot_async
+
+QUICKSAVE_PATH = "quicksave.snap"
 
 
 class MainScene:
-    def __init__(self):
+    def __init__(self, scene_path=DEFAULT_SCENE, profile_path=None, record_path=None):
         pygame.init()
         pygame.display.gl_set_attribute(pygame.GL_MULTISAMPLEBUFFERS, 1)
         pygame.display.gl_set_attribute(pygame.GL_MULTISAMPLESAMPLES, 4)
         self.display = (1000, 600)
+        self.fovy, self.near, self.far = 45.0, 0.1, 50.0
         pygame.display.set_mode(self.display, DOUBLEBUF | OPENGL)
         glEnable(GL_MULTISAMPLE)
         self.init_gl()
 
         self.hud = HUD(self.display)
-        self.day_night = DayNightCycle()
-        self.ball_force = 20.0
-
-        self.ball = Ball(
-            position=[5, 5, 0.0],
-            radius=0.4,
-            mass=0.5,
-            force=self.ball_force,
-            bounding_box_size=(-0.35, 0.35, 0.35),
-        )
-
-        self.ball1 = Ball(
-            position=[5, 10, 0.0],
-            radius=0.4,
-            mass=0.5,
-            bounding_box_size=(-0.35, 0.35, 0.35),
+        self.ground = GroundRenderer()
+        self.wall_quads = None
+        # Projected sphere size in pixels needed for each finer level
+        self.sphere_lod = SphereLOD(
+            levels=((32, 16), (16, 8), (8, 6)), thresholds=(60.0, 20.0)
         )
+        self.ball_renderer = BallRenderer(lod=self.sphere_lod)
 
-        collision_thickness = 2.0
-
-        self.wall1 = CollisionShape(
-            position=[21, 0, 0],
-            bounding_box_size=[
-                (-collision_thickness / 2, 0, -20),
-                (collision_thickness / 2, 20, 20),
-            ],
-        )
-
-        self.wall2 = CollisionShape(
-            position=[-21, 0, 0],
-            bounding_box_size=[
-                (-collision_thickness / 2, 0, -20),
-                (collision_thickness / 2, 20, 20),
-            ],
-        )
+        # Bodies, walls, physics constants and the day/night settings all
+        # come from the scene file
+        self.scene = load_scene(scene_path)
+        self.ball = self.scene.player
+        self.walls = self.scene.shapes
+        self.day_night = self.scene.create_day_night()
 
-        self.wall3 = CollisionShape(
-            position=[0, 0, -21],
-            bounding_box_size=[
-                (-20, 0, -collision_thickness / 2),
-                (20, 20, collision_thickness / 2),
-            ],
-        )
-
-        self.wall4 = CollisionShape(
-            position=[0, 0, 21],
-            bounding_box_size=[
-                (-20, 0, -collision_thickness / 2),
-                (20, 20, collision_thickness / 2),
-            ],
-        )
-
-        self.gravity_earth = 9.8
-        self.gravity_moon = 1.62
+        self.gravity_earth = self.scene.physics["gravity"]
+        self.gravity_moon = self.scene.physics["moon_gravity"]
         self.gravity = self.gravity_earth
 
         self.camera = Camera(offset=(0, 2, 6))
         self.clock = pygame.time.Clock()
+        # Physics runs at its own fixed rate, rendering interpolates
+        self.physics = self.scene.create_scheduler()
+        # Only contact groups that move fast or sink into each other get
+        # their step split
+        self.stepper = AdaptiveStepper()
+        self.frame_substeps = 0
+        self.keymap = {}
+        # F3 toggles the timing overlay; with a profile path the timings are
+        # also collected from the start and written out on exit
+        self.profile_path = profile_path
+        self.profiler = FrameProfiler(enabled=profile_path is not None)
+        self.show_profile = False
+        profile = self.profiler.phase
+        # Frame times, keys and checksums for replay.py
+        self.recorder = None
+        if record_path is not None:
+            self.recorder = ReplayWriter(
+                record_path, self.physics.step_dt, self.physics.max_substeps, scene_path=scene_path
+            )
 
         self.running = True
         while self.running:
             dt = self.clock.tick(60) / 1000  # detik/frame
+            self.profiler.begin_frame()
             self.handle_events()
 
-            self.day_night.update(dt)
-            self.day_night.setup_lighting()
+            with profile("lighting"):
+                self.day_night.update(dt)
+                self.day_night.setup_lighting()
 
             glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
             glLoadIdentity()
 
             keys = pygame.key.get_pressed()
 
-            keymap = {
+            self.keymap = keymap = {
                 "w": keys[pygame.K_w],
                 "a": keys[pygame.K_a],
                 "s": keys[pygame.K_s],
@@ -111,72 +109,76 @@ class MainScene:
                 "x": keys[pygame.K_x],
             }
 
-            self.camera.update(keymap, self.ball.position, self.ball.yaw)
+            with profile("physics"):
+                self.frame_substeps = 0
+                self.physics.advance(dt, self.step_physics)
+            if self.recorder is not None:
+                self.recorder.write_frame(dt, keymap, self.gravity, self.ball.force)
+            alpha = self.physics.alpha
+            ball_position = self.ball.get_render_position(alpha)
+
+            self.camera.update(keymap, ball_position, self.ball.yaw)
+            frustum = Frustum(self.projection, self.camera.view_matrix)
+
+            # Draw phases time the CPU side; GPU time shows up in "flip"
+            with profile("ground"):
+                self.draw_ground()
+            with profile("walls"):
+                self.draw_walls(frustum=frustum)
+            with profile("shapes"):
+                CollisionShape.draw_all_bounding_boxes(frustum)
+            eye = self.camera.eye
+            with profile("sky"):
+                self.day_night.draw_sky_objects(self.sphere_lod, eye, self.fovy, self.display[1])
+
+            with profile("balls"):
+                self.ball_renderer.draw_world(
+                    RigidBody3D.world, alpha, eye, self.fovy, self.display[1], frustum
+                )
 
-            RigidBody3D.check_all_collisions()
-            CollisionShape.check_all_collisions_with_rigidbody()
-            self.draw_ground()
-            self.draw_walls()
-            self.day_night.draw_sky_objects()
-
-            # draw ball
             glPushMatrix()
-            glTranslatef(*self.ball.position)
-            glRotatef(self.ball.rotation_angle, *self.ball.rotation_axis)
-            glColor3f(1.0, 1.0, 0.0)
-            quad = gluNewQuadric()
-            gluSphere(quad, self.ball.radius, 32, 16)
-            gluDeleteQuadric(quad)
-            glColor3f(0.2, 0.2, 0.2)
-            glLineWidth(2)
-            for i in range(0, 360, 45):
-                glBegin(GL_LINE_STRIP)
-                for theta in np.linspace(0, np.pi, 32):
-                    x = self.ball.radius * np.sin(theta) * np.cos(np.radians(i))
-                    y = self.ball.radius * np.cos(theta)
-                    z = self.ball.radius * np.sin(theta) * np.sin(np.radians(i))
-                    glVertex3f(x, y, z)
-                glEnd()
-
-            self.ball.update(dt, keymap, gravity=self.gravity)
+            self.ball.draw_arrow(ball_position)
             glPopMatrix()
-
-            # draw ball1
-            glPushMatrix()
-            glTranslatef(*self.ball1.position)
-            glRotatef(self.ball1.rotation_angle, *self.ball1.rotation_axis)
-            glColor3f(1.0, 1.0, 0.0)
-            quad = gluNewQuadric()
-            gluSphere(quad, self.ball1.radius, 32, 16)
-            gluDeleteQuadric(quad)
-            # Ball lines
-            glColor3f(0.2, 0.2, 0.2)
-            glLineWidth(2)
-            for i in range(0, 360, 45):
-                glBegin(GL_LINE_STRIP)
-                for theta in np.linspace(0, np.pi, 32):
-                    x = self.ball1.radius * np.sin(theta) * np.cos(np.radians(i))
-                    y = self.ball1.radius * np.cos(theta)
-                    z = self.ball1.radius * np.sin(theta) * np.sin(np.radians(i))
-                    glVertex3f(x, y, z)
-                glEnd()
-
-            self.ball1.update(dt, {}, gravity=self.gravity)
-            glPopMatrix()
-
-            glPushMatrix()
-            self.ball.draw_arrow()
-            glPopMatrix()
-            self.draw_hud()
-            pygame.display.flip()
-
+            with profile("hud"):
+                self.draw_hud()
+            with profile("flip"):
+                pygame.display.flip()
+            self.profiler.end_frame()
+
+        if self.profile_path is not None:
+            self.profiler.dump(self.profile_path)
+        if self.recorder is not None:
+            self.recorder.close()
         pygame.quit()
 
+    def step_physics(self, dt):
+        self.stepper.step(
+            dt, self.gravity, player=self.ball, keymap=self.keymap, profiler=self.profiler
+        )
+        self.frame_substeps += self.stepper.substeps
+
     def handle_events(self):
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 self.running = False
             if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_F3:
+                    self.show_profile = not self.show_profile
+                    self.profiler.enabled = self.show_profile or self.profile_path is not None
+                if event.key == pygame.K_F5:
+                    # Written on a background thread, the frame keeps going
+                    save_snapshot_async(QUICKSAVE_PATH)
+                if event.key == pygame.K_F9 and os.path.exists(QUICKSAVE_PATH):
+                    # A replay log has no way to express the jump to the saved
+                    # state, so the recording ends at the last frame before it
+                    if self.recorder is not None:
+                        self.recorder.close()
+                        self.recorder = None
+                        print("Quickload: recording stopped")
+                    player = self.ball._index
+                    bodies, self.walls = load_snapshot(QUICKSAVE_PATH)
+                    self.ball = bodies[player]
+                    self.physics.accumulator = 0.0
                 if event.key == pygame.K_h:
                     self.gravity = (
                         self.gravity_moon
@@ -196,58 +198,35 @@ class MainScene:
         glClearColor(0.5, 0.7, 1.0, 1.0)
         glMatrixMode(GL_PROJECTION)
         glLoadIdentity()
-        gluPerspective(45, (self.display[0] / self.display[1]), 0.1, 50.0)
+        gluPerspective(self.fovy, (self.display[0] / self.display[1]), self.near, self.far)
+        self.projection = perspective_matrix(
+            self.fovy, self.display[0] / self.display[1], self.near, self.far
+        )
         glMatrixMode(GL_MODELVIEW)
         glLoadIdentity()
 
     def draw_ground(self, size=20, tile_size=1):
-        dark_gray = (0.3, 0.3, 0.3)
-        light_gray = (0.7, 0.7, 0.7)
-        glBegin(GL_QUADS)
-        for x in range(-size, size):
-            for z in range(-size, size):
-                if (x + z) % 2 == 0:
-                    glColor3f(*dark_gray)
-                else:
-                    glColor3f(*light_gray)
-                glVertex3f(x * tile_size, 0, z * tile_size)
-                glVertex3f(x * tile_size, 0, (z + 1) * tile_size)
-                glVertex3f((x + 1) * tile_size, 0, (z + 1) * tile_size)
-                glVertex3f((x + 1) * tile_size, 0, z * tile_size)
-        glEnd()
+        self.ground.draw(size, tile_size)
 
-    def draw_walls(self, size=20):
-        glBegin(GL_QUADS)
-        glColor3f(0.5, 0.5, 0.5)
+    def draw_walls(self, size=20, frustum=None):
+        if self.wall_quads is None or self.wall_quads.shape[1] != 2 * size:
+            self.wall_quads = build_wall_quads(size)
         camera_x, _, camera_z = self.camera.position
         wall_threshold = 3.0
 
-        for x in range(-size, size):
-            if abs(camera_z + size) > wall_threshold:
-                glVertex3f(x, 0, -size)
-                glVertex3f(x, size, -size)
-                glVertex3f(x + 1, size, -size)
-                glVertex3f(x + 1, 0, -size)
-
-            if abs(camera_z - size) > wall_threshold:
-                glVertex3f(x, 0, size)
-                glVertex3f(x + 1, 0, size)
-                glVertex3f(x + 1, size, size)
-                glVertex3f(x, size, size)
-
-            if abs(camera_x + size) > wall_threshold:
-                glVertex3f(-size, 0, x)
-                glVertex3f(-size, size, x)
-                glVertex3f(-size, size, x + 1)
-                glVertex3f(-size, 0, x + 1)
-
-            if abs(camera_x - size) > wall_threshold:
-                glVertex3f(size, 0, x)
-                glVertex3f(size, 0, x + 1)
-                glVertex3f(size, size, x + 1)
-                glVertex3f(size, size, x)
+        shown = (
+            np.abs([camera_z + size, camera_z - size, camera_x + size, camera_x - size])
+            > wall_threshold
+        )
+        quads = self.wall_quads[shown].reshape(-1, 4, 3)
+        if frustum is not None:
+            quads = quads[frustum.contains_aabbs(quads.min(axis=1), quads.max(axis=1))]
 
-        glEnd()
+        glColor3f(0.5, 0.5, 0.5)
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glVertexPointer(3, GL_FLOAT, 0, np.ascontiguousarray(quads))
+        glDrawArrays(GL_QUADS, 0, len(quads) * 4)
+        glDisableClientState(GL_VERTEX_ARRAY)
 
     def draw_hud(self):
         light_gray = (1, 1, 1)
@@ -268,7 +247,24 @@ class MainScene:
         )
         self.hud.draw_text(f"Target Speed: {self.ball.force} m/s", 20, 150)
         # self.hud.draw_compass(x=900, y=80, size=50, yaw=self.r2d2.yaw)
+        if self.show_profile:
+            self.draw_profile()
+
+    def draw_profile(self):
+        top = self.display[1] - 30
+        lines = [f"substeps this frame: {self.frame_substeps}"] + self.profiler.overlay_lines()
+        for row, line in enumerate(lines):
+            self.hud.draw_text(line, 600, top - 20 * row, size=16)
 
 
 if __name__ == "__main__":
-    scene = MainScene()
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scene", default=DEFAULT_SCENE, help="scene description (.json, or .toml on Python 3.11+)")
+    parser.add_argument(
+        "--profile", metavar="PATH", help="write per-phase frame timings to a .json or .csv file on exit"
+    )
+    parser.add_argument(
+        "--record", metavar="PATH", help="record the session for headless replay with replay.py"
+    )
+    args = parser.parse_args()
+    scene = MainScene(args.scene, profile_path=args.profile, record_path=args.record)
@@ -0,0 +1,53 @@
+import ctypes
+
+import numpy as np
+from OpenGL.GL import *
+
+
+class MeshBuffer:
+    # One static VBO of interleaved (r, g, b, nx, ny, nz, x, y, z) rows
+    stride = 9 * 4
+
+    def __init__(self, vertices, normals=None, colors=None, mode=GL_TRIANGLES):
+        vertices = np.asarray(vertices, dtype=np.float32).reshape(-1, 3)
+        normals = np.zeros_like(vertices) if normals is None else normals
+        colors = np.ones_like(vertices) if colors is None else colors
+        self.data = np.ascontiguousarray(
+            np.hstack([colors, normals, vertices]), dtype=np.float32
+        )
+        self.vertex_count = len(vertices)
+        self.mode = mode
+        self.vbo = None
+
+    def upload(self):
+        self.vbo = glGenBuffers(1)
+        glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
+        glBufferData(GL_ARRAY_BUFFER, self.data.nbytes, self.data, GL_STATIC_DRAW)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+    def bind(self, use_colors=True):
+        if self.vbo is None:
+            self.upload()
+        glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
+        glPushClientAttrib(GL_CLIENT_VERTEX_ARRAY_BIT)
+        if use_colors:
+            glEnableClientState(GL_COLOR_ARRAY)
+            glColorPointer(3, GL_FLOAT, self.stride, ctypes.c_void_p(0))
+        glEnableClientState(GL_NORMAL_ARRAY)
+        glNormalPointer(GL_FLOAT, self.stride, ctypes.c_void_p(12))
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glVertexPointer(3, GL_FLOAT, self.stride, ctypes.c_void_p(24))
+
+    def unbind(self):
+        glPopClientAttrib()
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+    def draw(self, use_colors=True):
+        self.bind(use_colors)
+        glDrawArrays(self.mode, 0, self.vertex_count)
+        self.unbind()
+
+    def delete(self):
+        if self.vbo is not None:
+            glDeleteBuffers(1, [self.vbo])
+            self.vbo = None
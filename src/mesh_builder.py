@@ -0,0 +1,239 @@
+from math import cos, pi, radians, sin
+
+import numpy as np
+
+DARK_GRAY = (0.3, 0.3, 0.3)
+LIGHT_GRAY = (0.7, 0.7, 0.7)
+
+
+def _quads_to_triangles(grid):
+    # (rows, cols, ...) grid of strip vertices -> two triangles per cell
+    a, b = grid[:-1, :-1], grid[1:, :-1]
+    c, d = grid[1:, 1:], grid[:-1, 1:]
+    return np.stack([a, b, c, a, c, d], axis=2).reshape((-1,) + grid.shape[2:])
+
+
+def sphere_band_triangles(radius, slices, stacks, first_stack=0, last_stack=None):
+    # Latitude bands first_stack..last_stack of a z-up sphere, like the
+    # GL_QUAD_STRIP loop in draw_half_sphere
+    last_stack = stacks if last_stack is None else last_stack
+    lat = pi * (-0.5 + np.arange(first_stack, last_stack + 1) / stacks)
+    lng = 2 * pi * np.arange(slices + 1) / slices
+    normals = np.stack(
+        [
+            np.cos(lng)[None, :] * np.cos(lat)[:, None],
+            np.sin(lng)[None, :] * np.cos(lat)[:, None],
+            np.broadcast_to(np.sin(lat)[:, None], (len(lat), len(lng))),
+        ],
+        axis=-1,
+    )
+    normals = _quads_to_triangles(normals)
+    return radius * normals, normals
+
+
+def half_sphere_triangles(radius=0.4, slices=32, stacks=16):
+    return sphere_band_triangles(radius, slices, stacks, stacks // 2, stacks)
+
+
+def cylinder_triangles(radius=0.5, height=1.0, slices=32):
+    # Open tube along +z, like gluCylinder with one stack
+    angle = 2 * pi * np.arange(slices + 1) / slices
+    ring = np.stack([np.sin(angle), np.cos(angle), np.zeros_like(angle)], axis=-1)
+    normals = np.stack([ring, ring])
+    vertices = np.stack([ring * radius, ring * radius + [0, 0, height]])
+    return _quads_to_triangles(vertices), _quads_to_triangles(normals)
+
+
+def partial_disk_triangles(inner, outer, slices=32, rings=1, start=0.0, sweep=360.0):
+    # Flat ring in the z = 0 plane facing +z, angles measured from +y
+    # towards +x like gluPartialDisk
+    angle = np.radians(start + sweep * np.arange(slices + 1) / slices)
+    radius = np.linspace(inner, outer, rings + 1)
+    vertices = np.stack(
+        [
+            radius[:, None] * np.sin(angle)[None, :],
+            radius[:, None] * np.cos(angle)[None, :],
+            np.zeros((rings + 1, slices + 1)),
+        ],
+        axis=-1,
+    )
+    vertices = _quads_to_triangles(vertices)
+    normals = np.broadcast_to([0.0, 0.0, 1.0], vertices.shape)
+    return vertices, normals
+
+
+def disk_triangles(radius=0.5, slices=32):
+    return partial_disk_triangles(0.0, radius, slices)
+
+
+_CUBE_FACES = [
+    # normal, four corners in draw_cube order
+    ((0, 0, 1), [(-1, -1, 1), (1, -1, 1), (1, 1, 1), (-1, 1, 1)]),
+    ((0, 0, -1), [(-1, -1, -1), (-1, 1, -1), (1, 1, -1), (1, -1, -1)]),
+    ((-1, 0, 0), [(-1, -1, -1), (-1, -1, 1), (-1, 1, 1), (-1, 1, -1)]),
+    ((1, 0, 0), [(1, -1, -1), (1, 1, -1), (1, 1, 1), (1, -1, 1)]),
+    ((0, 1, 0), [(-1, 1, -1), (-1, 1, 1), (1, 1, 1), (1, 1, -1)]),
+    ((0, -1, 0), [(-1, -1, -1), (1, -1, -1), (1, -1, 1), (-1, -1, 1)]),
+]
+
+
+def cube_triangles(size=1.0):
+    corners = np.array([corners for _, corners in _CUBE_FACES], dtype=float)
+    vertices = corners[:, [0, 1, 2, 0, 2, 3]].reshape(-1, 3) * (size / 2.0)
+    normals = np.repeat([normal for normal, _ in _CUBE_FACES], 6, axis=0)
+    return vertices, normals.astype(float)
+
+
+def rotation_matrix(angle, x, y, z):
+    # Same matrix glRotatef builds, angle in degrees
+    axis = np.array([x, y, z], dtype=float)
+    x, y, z = axis / np.linalg.norm(axis)
+    c, s = cos(radians(angle)), sin(radians(angle))
+    t = 1 - c
+    return np.array(
+        [
+            [t * x * x + c, t * x * y - s * z, t * x * z + s * y, 0],
+            [t * x * y + s * z, t * y * y + c, t * y * z - s * x, 0],
+            [t * x * z - s * y, t * y * z + s * x, t * z * z + c, 0],
+            [0, 0, 0, 1],
+        ]
+    )
+
+
+class MeshBuilder:
+    # Records primitives under a glPushMatrix-style transform stack into
+    # flat triangle arrays
+    def __init__(self):
+        self.matrix = np.identity(4)
+        self.stack = []
+        self.current_color = (1.0, 1.0, 1.0)
+        self.vertices, self.normals, self.colors = [], [], []
+
+    def push_matrix(self):
+        self.stack.append(self.matrix.copy())
+
+    def pop_matrix(self):
+        self.matrix = self.stack.pop()
+
+    def translate(self, x, y, z):
+        translation = np.identity(4)
+        translation[:3, 3] = (x, y, z)
+        self.matrix = self.matrix @ translation
+
+    def rotate(self, angle, x, y, z):
+        self.matrix = self.matrix @ rotation_matrix(angle, x, y, z)
+
+    def scale(self, x, y, z):
+        self.matrix = self.matrix @ np.diag([x, y, z, 1.0])
+
+    def color(self, r, g, b):
+        self.current_color = (r, g, b)
+
+    def add(self, triangles):
+        vertices, normals = triangles
+        linear = self.matrix[:3, :3]
+        vertices = vertices @ linear.T + self.matrix[:3, 3]
+        normals = normals @ np.linalg.inv(linear)
+        lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+        normals = normals / np.where(lengths > 0, lengths, 1.0)
+        self.vertices.append(vertices)
+        self.normals.append(normals)
+        self.colors.append(np.broadcast_to(self.current_color, vertices.shape))
+
+    def cylinder(self, radius=0.5, height=1.0, slices=32):
+        self.add(cylinder_triangles(radius, height, slices))
+
+    def disk(self, radius=0.5, slices=32):
+        self.add(disk_triangles(radius, slices))
+
+    def partial_disk(self, inner, outer, slices, rings, start, sweep):
+        self.add(partial_disk_triangles(inner, outer, slices, rings, start, sweep))
+
+    def half_sphere(self, radius=0.4, slices=32, stacks=16):
+        self.add(half_sphere_triangles(radius, slices, stacks))
+
+    def sphere(self, radius=0.5, slices=32, stacks=16):
+        self.add(sphere_band_triangles(radius, slices, stacks))
+
+    def cube(self, size=1.0):
+        self.add(cube_triangles(size))
+
+    def build(self):
+        # (vertices, normals, colors) float32 arrays of shape (N, 3)
+        if not self.vertices:
+            empty = np.zeros((0, 3), dtype=np.float32)
+            return empty, empty.copy(), empty.copy()
+        return tuple(
+            np.concatenate(parts).astype(np.float32)
+            for parts in (self.vertices, self.normals, self.colors)
+        )
+
+
+def build_ground_mesh(size=20, tile_size=1):
+    # Checkerboard floor as interleaved (r, g, b, x, y, z) rows, four
+    # vertices per tile in GL_QUADS order
+    x, z = np.meshgrid(np.arange(-size, size), np.arange(-size, size), indexing="ij")
+    x, z = x.ravel(), z.ravel()
+    colors = np.where(((x + z) % 2 == 0)[:, None], DARK_GRAY, LIGHT_GRAY)
+
+    vertices = np.zeros((len(x), 4, 6), dtype=np.float32)
+    vertices[:, :, :3] = colors[:, None, :]
+    vertices[:, :, 3] = (x[:, None] + [0, 0, 1, 1]) * tile_size
+    vertices[:, :, 5] = (z[:, None] + [0, 1, 1, 0]) * tile_size
+    return vertices.reshape(-1, 6)
+
+
+def build_wall_quads(size=20):
+    # (4, 2 * size, 4, 3) unit-wide segments of the -z, +z, -x and +x walls,
+    # in the same vertex order as the old immediate-mode draw_walls
+    x = np.arange(-size, size)[:, None]
+    along = [(0, 0, 1, 1), (0, 1, 1, 0), (0, 0, 1, 1), (0, 1, 1, 0)]
+    up = [(0, 1, 1, 0), (0, 0, 1, 1), (0, 1, 1, 0), (0, 0, 1, 1)]
+    sides = [(2, -size), (2, size), (0, -size), (0, size)]
+
+    quads = np.empty((4, 2 * size, 4, 3), dtype=np.float32)
+    for wall, (axis, position) in enumerate(sides):
+        quads[wall, :, :, 2 - axis] = x + np.array(along[wall])
+        quads[wall, :, :, 1] = np.array(up[wall]) * size
+        quads[wall, :, :, axis] = position
+    return quads
+
+
+def meridian_lines(meridians=8, points=32):
+    # The dark lines drawn over each ball, as GL_LINES segment pairs on a
+    # unit sphere
+    theta = np.linspace(0, np.pi, points)
+    phi = np.radians(np.arange(0, 360, 360 // meridians))[:, None]
+    strips = np.stack(
+        [
+            np.sin(theta) * np.cos(phi),
+            np.broadcast_to(np.cos(theta), (len(phi), points)),
+            np.sin(theta) * np.sin(phi),
+        ],
+        axis=-1,
+    )
+    return np.stack([strips[:, :-1], strips[:, 1:]], axis=2).reshape(-1, 3)
+
+
+def build_instance_matrices(positions, axes, angles, radii):
+    # Per-ball glTranslatef(position) * glRotatef(angle, axis) * scale(radius)
+    # as column-major float32 matrices ready for glMultMatrixf
+    positions = np.asarray(positions, dtype=float).reshape(-1, 3)
+    axes = np.asarray(axes, dtype=float).reshape(-1, 3)
+    lengths = np.linalg.norm(axes, axis=1, keepdims=True)
+    # Balls that never rolled have a zero axis, treat it as no rotation
+    k = np.where(lengths > 0, axes / np.where(lengths > 0, lengths, 1.0), 0.0)
+    theta = np.radians(np.asarray(angles, dtype=float)) * (lengths[:, 0] > 0)
+    c, s = np.cos(theta)[:, None, None], np.sin(theta)[:, None, None]
+
+    cross = np.zeros((len(k), 3, 3))
+    cross[:, 0, 1], cross[:, 0, 2] = -k[:, 2], k[:, 1]
+    cross[:, 1, 0], cross[:, 1, 2] = k[:, 2], -k[:, 0]
+    cross[:, 2, 0], cross[:, 2, 1] = -k[:, 1], k[:, 0]
+    rotation = c * np.identity(3) + s * cross + (1 - c) * k[:, :, None] * k[:, None, :]
+
+    matrices = np.zeros((len(k), 4, 4), dtype=np.float32)
+    matrices[:, :3, :3] = rotation * np.asarray(radii, dtype=float).reshape(-1, 1, 1)
+    matrices[:, :3, 3] = positions
+    matrices[:, 3, 3] = 1.0
+    return np.ascontiguousarray(matrices.transpose(0, 2, 1))
@@ -0,0 +1,203 @@
+import numpy as np
+
+
+def column_property(name):
+    # Attribute stored in a row of the body's PhysicsWorld column `name`
+    def fget(self):
+        return getattr(self.world, name)[self._index]
+
+    def fset(self, value):
+        getattr(self.world, name)[self._index] = value
+
+    return property(fget, fset)
+
+
+class PhysicsWorld:
+    # name -> (dtype, shape of one row, default value)
+    columns = {
+        "position": (float, (3,), 0.0),
+        "previous_position": (float, (3,), 0.0),
+        "velocity": (float, (3,), 0.0),
+        "forces": (float, (3,), 0.0),
+        "mass": (float, (), 1.0),
+        "friction": (float, (), 0.2),
+        "bounciness": (float, (), 0.5),
+        "on_ground": (bool, (), False),
+        "bb_min": (float, (3,), 0.0),
+        "bb_max": (float, (3,), 0.0),
+        "radius": (float, (), 0.0),
+        "rotation_axis": (float, (3,), 0.0),
+        "rotation_angle": (float, (), 0.0),
+        "yaw": (float, (), 0.0),
+        "color": (float, (3,), (1.0, 1.0, 0.0)),
+        "awake": (bool, (), True),
+        "sleep_timer": (float, (), 0.0),
+        # Deepest contact the narrowphase resolved during the last step;
+        # cleared at the start of each step by sim.step_physics and
+        # AdaptiveStepper
+        "penetration": (float, (), 0.0),
+        # Body class code (RigidBody3D.kind) and Ball.force, kept here so a
+        # snapshot is nothing but column copies
+        "kind": (np.uint8, (), 0),
+        "force": (float, (), 0.0),
+    }
+
+    def __init__(self, capacity=64, sleep_speed=0.05, sleep_time=0.5):
+        self.sleep_speed = sleep_speed
+        self.sleep_time = sleep_time
+        self.bodies = []
+        self.count = 0
+        self.capacity = 0
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        # Views handed out before a reallocation keep pointing at the old
+        # arrays, so bodies always index the world instead of caching rows.
+        for name, (dtype, shape, default) in self.columns.items():
+            array = np.full((capacity,) + shape, default, dtype=dtype)
+            if self.capacity:
+                array[: self.count] = getattr(self, name)[: self.count]
+            setattr(self, name, array)
+        self.capacity = capacity
+
+    def reserve(self, count):
+        if count > self.capacity:
+            self._allocate(max(count, 2 * self.capacity))
+
+    def add(self, body):
+        self.reserve(self.count + 1)
+        index = self.count
+        for name, (dtype, shape, default) in self.columns.items():
+            getattr(self, name)[index] = default
+        self.bodies.append(body)
+        self.count += 1
+        return index
+
+    def add_rows(self, count):
+        # Bulk add: `count` new rows holding the column defaults, the caller
+        # appends their bodies
+        self.reserve(self.count + count)
+        rows = np.arange(self.count, self.count + count)
+        for name, (dtype, shape, default) in self.columns.items():
+            getattr(self, name)[rows] = default
+        self.count += count
+        return rows
+
+    def clear(self):
+        # Bodies list is shared with RigidBody3D.instances, keep it in place
+        del self.bodies[:]
+        self.count = 0
+
+    def get_aabbs(self):
+        n = self.count
+        return self.position[:n] + self.bb_min[:n], self.position[:n] + self.bb_max[:n]
+
+    def get_swept_aabbs(self, dt):
+        # Boxes grown to cover where each body gets to at its current
+        # velocity over dt
+        mins, maxs = self.get_aabbs()
+        motion = self.velocity[: self.count] * dt
+        return mins + np.minimum(motion, 0), maxs + np.maximum(motion, 0)
+
+    def store_previous(self):
+        n = self.count
+        self.previous_position[:n] = self.position[:n]
+
+    def interpolated_positions(self, alpha):
+        n = self.count
+        previous = self.previous_position[:n]
+        return previous + (self.position[:n] - previous) * alpha
+
+    def awake_rows(self):
+        # A slice while nobody sleeps keeps the hot path on plain views
+        n = self.count
+        awake = self.awake[:n]
+        if awake.all():
+            return slice(0, n)
+        return np.flatnonzero(awake)
+
+    def wake(self, rows):
+        self.awake[rows] = True
+        self.sleep_timer[rows] = 0.0
+
+    def sleep(self, rows):
+        self.awake[rows] = False
+        self.velocity[rows] = 0
+
+    def step(self, dt, gravity=9.8, rows=None):
+        # rows: ascending indices to integrate, all bodies by default
+        rows = self.awake_rows() if rows is None else rows[self.awake[rows]]
+        mass = self.mass[rows]
+        forces = self.forces[rows]
+        velocity = self.velocity[rows]
+        if len(mass) == 0:
+            return
+
+        forces[:, 1] -= gravity * mass
+        self.apply_friction(forces, rows)
+
+        acceleration = forces / mass[:, None]
+        # RigidBody3D.update aliases initial_velocity to the updated
+        # velocity, integrate the same way so both paths agree
+        velocity += acceleration * dt
+        self.velocity[rows] = velocity
+        self.position[rows] += velocity * dt + 0.5 * acceleration * dt * dt
+        self.forces[rows] = 0
+
+        self.check_ground(rows)
+        self.update_rolling(dt, rows)
+        self.update_sleeping(dt, rows, gravity)
+
+    def apply_friction(self, forces, rows):
+        grounded = self.on_ground[rows]
+        friction = self.friction[rows] * grounded
+        forces[:, 0::2] -= friction[:, None] * self.velocity[rows][:, 0::2]
+
+    def check_ground(self, rows, ground_height=0.4):
+        position = self.position[rows]
+        velocity = self.velocity[rows]
+        on_ground = self.on_ground[rows]
+
+        below = position[:, 1] <= ground_height
+        position[below, 1] = ground_height
+        falling = below & (velocity[:, 1] < 0)
+        velocity[falling, 1] = -velocity[falling, 1] * self.friction[rows][falling]
+        settled = falling & (np.abs(velocity[:, 1]) < 0.1)
+        velocity[settled, 1] = 0
+
+        on_ground[settled] = True
+        on_ground[falling & ~settled] = False
+        on_ground[below & ~falling] = True
+
+        self.position[rows] = position
+        self.velocity[rows] = velocity
+        self.on_ground[rows] = on_ground
+
+    def update_rolling(self, dt, rows):
+        # Same as Ball.update_rolling for every row with a radius
+        rows = np.arange(self.count)[rows]
+        flat = self.velocity[rows]
+        flat[:, 1] = 0
+        speed = np.linalg.norm(flat, axis=1)
+        axis = np.cross([0.0, 1.0, 0.0], flat)
+        axis_norm = np.linalg.norm(axis, axis=1)
+        rolling = (self.radius[rows] > 0) & (speed > 1e-6) & (axis_norm > 1e-6)
+        if not rolling.any():
+            return
+        rows, speed = rows[rolling], speed[rolling]
+        self.rotation_axis[rows] = axis[rolling] / axis_norm[rolling, None]
+        self.rotation_angle[rows] += np.degrees(speed * dt / self.radius[rows])
+
+    def update_sleeping(self, dt, rows, gravity=9.8):
+        # Bodies slower than sleep_speed for sleep_time seconds stop being
+        # integrated until a contact, add_force or set_velocity wakes them.
+        # Speed leaves out this step's gravity pull on bodies the ground did
+        # not stop: a ball resting on another gains g * dt every step before
+        # the contact takes it away again.
+        rows = np.arange(self.count)[rows]
+        velocity = self.velocity[rows]
+        velocity[~self.on_ground[rows], 1] += gravity * dt
+        speed = np.linalg.norm(velocity, axis=1)
+        timer = np.where(speed < self.sleep_speed, self.sleep_timer[rows] + dt, 0.0)
+        self.sleep_timer[rows] = timer
+        self.sleep(rows[timer >= self.sleep_time])
@@ -0,0 +1,128 @@
+import csv
+import json
+import time
+
+import numpy as np
+
+PERCENTILES = (50, 95, 99)
+
+
+class NullPhase:
+    # Shared do-nothing timer handed out while profiling is off
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NULL_PHASE = NullPhase()
+
+
+class PhaseTimer:
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class FrameProfiler:
+    # Named phase timers summed per frame, with the last `history` frames of
+    # every phase kept in a ring buffer for percentiles
+    def __init__(self, enabled=False, history=600):
+        self.enabled = enabled
+        self.history = history
+        self.timers = {}
+        self.current = {}
+        self.samples = {}
+        self.counts = {}
+        self.frames = 0
+        self.frame_start = None
+
+    def phase(self, name):
+        if not self.enabled:
+            return NULL_PHASE
+        if name not in self.timers:
+            self.timers[name] = PhaseTimer(self, name)
+        return self.timers[name]
+
+    def record(self, name, seconds):
+        # Phases hit several times in a frame (physics substeps) add up
+        self.current[name] = self.current.get(name, 0.0) + seconds
+
+    def begin_frame(self):
+        if self.enabled:
+            self.frame_start = time.perf_counter()
+
+    def end_frame(self):
+        if not self.enabled:
+            return
+        if self.frame_start is not None:
+            self.record("frame", time.perf_counter() - self.frame_start)
+            self.frame_start = None
+        for name, seconds in self.current.items():
+            if name not in self.samples:
+                self.samples[name] = np.zeros(self.history)
+                self.counts[name] = 0
+            self.samples[name][self.counts[name] % self.history] = seconds
+            self.counts[name] += 1
+        self.current = {}
+        self.frames += 1
+
+    def reset(self):
+        self.current, self.samples, self.counts = {}, {}, {}
+        self.frames = 0
+
+    def times(self, name):
+        # Recorded seconds of one phase, oldest first
+        samples, count = self.samples[name], self.counts[name]
+        if count <= self.history:
+            return samples[:count].copy()
+        start = count % self.history
+        return np.concatenate([samples[start:], samples[:start]])
+
+    def summary(self):
+        # Milliseconds per phase over the frames still in the ring buffers
+        summary = {}
+        for name in self.samples:
+            times = self.times(name) * 1000
+            stats = {"frames": len(times), "mean": float(times.mean()), "max": float(times.max())}
+            for q, value in zip(PERCENTILES, np.percentile(times, PERCENTILES)):
+                stats[f"p{q}"] = float(value)
+            summary[name] = stats
+        return summary
+
+    def overlay_lines(self):
+        # Slowest phases first, the frame total on top
+        summary = self.summary()
+        names = sorted(summary, key=lambda name: (name != "frame", -summary[name]["p95"]))
+        return [
+            f"{name}: p50 {summary[name]['p50']:.2f}  p95 {summary[name]['p95']:.2f}  "
+            f"p99 {summary[name]['p99']:.2f} ms"
+            for name in names
+        ]
+
+    def dump(self, path):
+        # JSON or CSV by file extension
+        summary = self.summary()
+        if str(path).endswith(".csv"):
+            columns = ["frames", "mean", "max"] + [f"p{q}" for q in PERCENTILES]
+            with open(path, "w", newline="") as file:
+                writer = csv.writer(file)
+                writer.writerow(["phase"] + columns)
+                for name, stats in summary.items():
+                    writer.writerow([name] + [stats[column] for column in columns])
+        else:
+            with open(path, "w") as file:
+                json.dump({"unit": "ms", "frames": self.frames, "phases": summary}, file, indent=2)
+
+
+NULL_PROFILER = FrameProfiler(enabled=False)
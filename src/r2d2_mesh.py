@@ -0,0 +1,193 @@
+from mesh_builder import MeshBuilder
+
+
+def build_r2d2_mesh():
+    mesh = MeshBuilder()
+    mesh.push_matrix()
+    
+    # Main body (white cylinder)
+    mesh.color(0.95, 0.95, 0.95)
+    mesh.rotate(-90, 1, 0, 0)  # Rotate cylinder to stand vertically
+    mesh.cylinder(radius=0.5, height=1.2)
+    
+    # Blue panels on body
+    mesh.color(0.1, 0.3, 0.8)
+    for i in range(6):
+        mesh.push_matrix()
+        mesh.rotate(i * 60, 0, 0, 1)
+        mesh.translate(0.45, 0, 0.2)
+        mesh.scale(0.15, 0.02, 0.8)
+        mesh.cube()
+        mesh.pop_matrix()
+    
+    # Lower blue ring
+    mesh.push_matrix()
+    mesh.translate(0, 0, 0.1)
+    mesh.disk(radius=0.51)
+    mesh.translate(0, 0, -0.01)
+    mesh.partial_disk(0.45, 0.51, 32, 1, 0, 360)
+    mesh.pop_matrix()
+    
+    # Middle dome (head)
+    mesh.translate(0, 0, 1.2)
+    mesh.color(0.95, 0.95, 0.95)
+    mesh.disk(radius=0.5)
+    
+    # Dome top
+    mesh.push_matrix()
+    mesh.translate(0, -0.05, 0.005)
+    mesh.half_sphere(radius=0.50, slices=32, stacks=16)
+    
+    # Dome details
+    mesh.color(0.1, 0.3, 0.8)
+    
+    # Main eye
+    mesh.push_matrix()
+    mesh.translate(0, 0.35, 0.1)
+    mesh.rotate(90, 1, 0, 0)
+    mesh.cylinder(radius=0.08, height=0.1)
+    mesh.translate(0, 0, 0.1)
+    mesh.color(0.7, 0.1, 0.1)  # Red eye
+    mesh.disk(radius=0.08)
+    mesh.pop_matrix()
+    
+    # Side panels
+    for side in [-1, 1]:
+        mesh.push_matrix()
+        mesh.translate(side * 0.2, 0.25, 0.1)
+        mesh.scale(0.15, 0.05, 0.02)
+        mesh.cube()
+        mesh.pop_matrix()
+    
+    # Front panel
+    mesh.push_matrix()
+    mesh.translate(0, 0.2, 0.2)
+    mesh.scale(0.2, 0.05, 0.02)
+    mesh.cube()
+    mesh.pop_matrix()
+    
+    mesh.pop_matrix()  # End of dome details
+    
+    # Kaki-kaki (sekarang di bawah)
+    mesh.push_matrix()
+    mesh.translate(0, 0, -1.2)  # Pindahkan kaki ke bawah body
+    
+    # Kaki depan kiri
+    mesh.push_matrix()
+    mesh.translate(-0.35, 0, 0)
+    mesh.color(0.8, 0.8, 0.8)
+    
+    # Bagian utama kaki
+    mesh.push_matrix()
+    mesh.scale(0.3, 0.8, 0.3)
+    mesh.cube()
+    mesh.pop_matrix()
+    
+    # Kaki bawah
+    mesh.push_matrix()
+    mesh.translate(0, -0.5, 0)
+    mesh.scale(0.4, 0.1, 0.5)
+    mesh.cube()
+    mesh.pop_matrix()
+    
+    # Detail pergelangan kaki
+    mesh.color(0.1, 0.3, 0.8)
+    mesh.push_matrix()
+    mesh.translate(0, -0.2, 0.2)
+    mesh.scale(0.25, 0.1, 0.05)
+    mesh.cube()
+    mesh.pop_matrix()
+    
+    mesh.pop_matrix()  # End kaki depan kiri
+    
+    # Kaki depan kanan
+    mesh.push_matrix()
+    mesh.translate(0.35, 0, 0)
+    mesh.color(0.8, 0.8, 0.8)
+    
+    # Bagian utama kaki
+    mesh.push_matrix()
+    mesh.scale(0.3, 0.8, 0.3)
+    mesh.cube()
+    mesh.pop_matrix()
+    
+    # Kaki bawah
+    mesh.push_matrix()
+    mesh.translate(0, -0.5, 0)
+    mesh.scale(0.4, 0.1, 0.5)
+    mesh.cube()
+    mesh.pop_matrix()
+    
+    # Detail pergelangan kaki
+    mesh.color(0.1, 0.3, 0.8)
+    mesh.push_matrix()
+    mesh.translate(0, -0.2, 0.2)
+    mesh.scale(0.25, 0.1, 0.05)
+    mesh.cube()
+    mesh.pop_matrix()
+    
+    mesh.pop_matrix()  # End kaki depan kanan
+    
+    # Kaki belakang
+    mesh.push_matrix()
+    mesh.translate(0, 0, 0.3)
+    mesh.color(0.8, 0.8, 0.8)
+    
+    # Bagian utama kaki
+    mesh.push_matrix()
+    mesh.scale(0.25, 0.6, 0.25)
+    mesh.cube()
+    mesh.pop_matrix()
+    
+    # Kaki bawah
+    mesh.push_matrix()
+    mesh.translate(0, -0.4, -0.1)
+    mesh.scale(0.3, 0.1, 0.4)
+    mesh.cube()
+    mesh.pop_matrix()
+    
+    mesh.pop_matrix()  # End kaki belakang
+    
+    mesh.pop_matrix()  # End semua kaki
+    
+    # Arms (di sisi badan dan mengarah ke bawah)
+    for side in [-1, 1]:
+        mesh.push_matrix()
+
+        # Tempel di sisi badan dan cukup rendah
+        mesh.translate(side * 0.60, 0, -0.5)  # sisi badan (x), tinggi tengah (z)
+        mesh.rotate(180, 1, 0, 0)            # arahkan ke bawah (rotasi ke bawah)
+
+        # Bagian atas lengan (kecil)
+
+        mesh.color(0.8, 0.8, 0.8)
+        mesh.push_matrix()
+        mesh.translate(side * -0.05, 0, 0)
+        mesh.rotate(5 * side, 0, 1, 0)
+        mesh.rotate(-5 * -side, 0, 1, 0)
+        mesh.scale(0.1, 0.1, 0.4)  # segmen atas, lebih kecil
+        mesh.cube()
+        mesh.pop_matrix()
+
+        # Bagian bawah lengan (besar)
+        mesh.push_matrix()
+        mesh.translate(0, 0, 0.4)  # geser ke ujung segmen atas
+        mesh.scale(0.15, 0.15, 0.4)  # segmen bawah, lebih besar
+        mesh.cube()
+        mesh.pop_matrix()
+
+        # Tool di ujung lengan
+        mesh.color(0.3, 0.3, 0.3)
+        mesh.push_matrix()
+        mesh.translate(0, 0, 0.6)
+        mesh.rotate(0, 1, 0, 0)
+        mesh.cylinder(radius=0.05, height=0.2)
+        mesh.pop_matrix()
+
+        mesh.pop_matrix()
+
+
+
+    
+    mesh.pop_matrix()  # End of R2-D2
+    return mesh.build()
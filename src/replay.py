@@ -0,0 +1,178 @@
+import argparse
+import os
+import struct
+import time
+import zlib
+from collections import namedtuple
+
+from adaptive_step import AdaptiveStepper
+from fixed_step import FixedStepScheduler
+from scene import DEFAULT_SCENE, load_scene
+from rigid_body_3d import RigidBody3D
+
+MAGIC = b"GK3DREPL"
+VERSION = 2
+KEYS = ("w", "a", "s", "d", "left", "right", "shift", "space", "up", "down", "z", "x")
+
+# magic, version, flags, physics step, max substeps, length of the key names
+HEADER = struct.Struct("<8sHHdIH")
+# Since version 2, after the key names: CRC32 of the scene file, length of
+# its path
+SCENE = struct.Struct("<IH")
+# frame dt, pressed-key bitmask, gravity, player force
+FRAME = struct.Struct("<dIdd")
+CHECKSUM = struct.Struct("<I")
+HAS_CHECKSUMS = 1
+
+Frame = namedtuple("Frame", "dt keymap gravity force checksum")
+
+
+class ReplayMismatch(Exception):
+    pass
+
+
+def encode_keys(keymap, keys=KEYS):
+    mask = 0
+    for bit, key in enumerate(keys):
+        if keymap.get(key, False):
+            mask |= 1 << bit
+    return mask
+
+
+def decode_keys(mask, keys=KEYS):
+    return {key: bool(mask >> bit & 1) for bit, key in enumerate(keys)}
+
+
+def scene_checksum(path):
+    with open(path, "rb") as file:
+        return zlib.crc32(file.read())
+
+
+def world_checksum(world):
+    n = world.count
+    checksum = zlib.crc32(world.position[:n].tobytes())
+    return zlib.crc32(world.velocity[:n].tobytes(), checksum)
+
+
+class ReplayWriter:
+    # Appends one fixed-size record per frame; nothing is kept in memory, so
+    # a session of any length can be recorded. The header names the scene
+    # file the session started from, with a checksum of its contents.
+    def __init__(self, path, step_dt=1 / 120, max_substeps=8, checksums=True, scene_path=DEFAULT_SCENE):
+        self.file = open(path, "wb")
+        self.checksums = checksums
+        names = ",".join(KEYS).encode()
+        scene = os.path.abspath(scene_path).encode()
+        flags = HAS_CHECKSUMS if checksums else 0
+        self.file.write(HEADER.pack(MAGIC, VERSION, flags, step_dt, max_substeps, len(names)))
+        self.file.write(names)
+        self.file.write(SCENE.pack(scene_checksum(scene_path), len(scene)))
+        self.file.write(scene)
+        self.frames = 0
+
+    def write_frame(self, dt, keymap, gravity, force, world=None):
+        self.file.write(FRAME.pack(dt, encode_keys(keymap), gravity, force))
+        if self.checksums:
+            self.file.write(CHECKSUM.pack(world_checksum(world or RigidBody3D.world)))
+        self.frames += 1
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+class ReplayReader:
+    # Streams frames back from a log; a record cut short by a crash at the
+    # end of the file is ignored
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as file:
+            header = file.read(HEADER.size)
+            if len(header) < HEADER.size or header[:8] != MAGIC:
+                raise ValueError(f"{path} is not a replay log")
+            _, version, flags, self.step_dt, self.max_substeps, length = HEADER.unpack(header)
+            if version not in (1, VERSION):
+                raise ValueError(f"unsupported replay version {version}")
+            self.keys = tuple(file.read(length).decode().split(","))
+            # Version 1 logs did not record their scene
+            self.scene_path, self.scene_checksum = None, None
+            if version >= 2:
+                self.scene_checksum, scene_length = SCENE.unpack(file.read(SCENE.size))
+                self.scene_path = file.read(scene_length).decode()
+            self.data_offset = file.tell()
+        self.checksums = bool(flags & HAS_CHECKSUMS)
+        self.record_size = FRAME.size + (CHECKSUM.size if self.checksums else 0)
+
+    def __iter__(self):
+        with open(self.path, "rb") as file:
+            file.seek(self.data_offset)
+            while True:
+                record = file.read(self.record_size)
+                if len(record) < self.record_size:
+                    return
+                dt, mask, gravity, force = FRAME.unpack_from(record)
+                checksum = CHECKSUM.unpack_from(record, FRAME.size)[0] if self.checksums else None
+                yield Frame(dt, decode_keys(mask, self.keys), gravity, force, checksum)
+
+
+def check_scene(reader, scene_path):
+    # The recorded scene unless another one is given; either way its
+    # contents have to be the ones the session was recorded with
+    if scene_path is None:
+        scene_path = reader.scene_path or DEFAULT_SCENE
+        if not os.path.exists(scene_path):
+            raise ReplayMismatch(
+                f"recorded with scene {scene_path}, which no longer exists; pass its path with --scene"
+            )
+    if reader.scene_checksum is not None and scene_checksum(scene_path) != reader.scene_checksum:
+        raise ReplayMismatch(
+            f"recorded with scene {reader.scene_path}, {scene_path} has different contents"
+        )
+    return scene_path
+
+
+def replay(path, verify=True, scene_path=None):
+    # Loads the scene the session was recorded in and re-runs the recorded
+    # frames through the same scheduler and stepper, without a window
+    reader = ReplayReader(path)
+    player = load_scene(check_scene(reader, scene_path)).player
+    scheduler = FixedStepScheduler(reader.step_dt, reader.max_substeps)
+    stepper = AdaptiveStepper()
+    frames = 0
+    for frame in reader:
+        player.force = frame.force
+
+        def step(dt):
+            stepper.step(dt, frame.gravity, player=player, keymap=frame.keymap)
+
+        scheduler.advance(frame.dt, step)
+        if verify and frame.checksum is not None:
+            if world_checksum(RigidBody3D.world) != frame.checksum:
+                raise ReplayMismatch(f"state diverged from the recording at frame {frames}")
+        frames += 1
+    return frames, player
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Re-run a recorded session without a window")
+    parser.add_argument("path")
+    parser.add_argument("--scene", help="scene file to replay in, by default the one the log was recorded with")
+    parser.add_argument("--no-verify", action="store_true", help="skip the per-frame state checksums")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    frames, player = replay(args.path, not args.no_verify, args.scene)
+    elapsed = time.perf_counter() - start
+    recorded = sum(frame.dt for frame in ReplayReader(args.path))
+    print(f"{frames} frames ({recorded:.1f} s recorded) replayed in {elapsed:.3f} s")
+    print(f"player at {player.position.round(3).tolist()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,32 @@
 from object_3d import Object3D
+from physics_world import PhysicsWorld, column_property
+from broadphase import SpatialHashGrid, sort_pairs
+from bvh import StaticBVH
+from narrowphase import ContactSolver, resolve_body_pairs
 import numpy as np
-from OpenGL.GL import glBegin, glEnd, glVertex3f, glColor3f, GL_LINES
 
 
 class RigidBody3D(Object3D):
-    instances = []
+    world = PhysicsWorld()
+    instances = world.bodies
+    broadphase = SpatialHashGrid()
+    # Set to a ContactSolver with more workers to resolve contacts in threads
+    solver = ContactSolver()
+    # Sleeping bodies do not move; they sit in a tree that is rebuilt only
+    # when one falls asleep, wakes up or is moved
+    sleeping_bvh = StaticBVH()
+    sleeping_rows = np.empty(0, dtype=int)
+    # Code stored in the world's "kind" column, snapshot.KINDS maps it back
+    kind = 0
+
+    position = column_property("position")
+    velocity = column_property("velocity")
+    forces = column_property("forces")
+    mass = column_property("mass")
+    friction = column_property("friction")
+    bounciness = column_property("bounciness")
+    on_ground = column_property("on_ground")
+    awake = column_property("awake")
 
     def __init__(
         self,
@@ -15,23 +37,96 @@ class RigidBody3D(Object3D):
         bounding_box_size=None,
         bounciness=0.5,
     ):
-        RigidBody3D.instances.append(self)
+        # Row in the shared world arrays, registered before Object3D
+        # assigns position and bounding box through the properties below
+        self._index = RigidBody3D.world.add(self)
+        self.world.kind[self._index] = self.kind
 
         super().__init__(position, bounding_box_size)
-        self.velocity = np.array(
-            velocity if velocity is not None else [0.0, 0.0, 0.0], dtype=float
-        )
+        self.velocity = velocity if velocity is not None else [0.0, 0.0, 0.0]
         self.mass = mass
-        self.forces = np.zeros(3, dtype=float)
         self.friction = friction
         self.on_ground = False
         self.bounciness = bounciness
+        self.world.previous_position[self._index] = self.position
+
+    @staticmethod
+    def set_solver_threads(workers):
+        if RigidBody3D.solver.workers != max(1, workers):
+            RigidBody3D.solver.shutdown()
+            RigidBody3D.solver = ContactSolver(workers)
+
+    @classmethod
+    def create_many(
+        cls,
+        count,
+        position=None,
+        velocity=None,
+        mass=1.0,
+        friction=0.2,
+        bounding_box_size=None,
+        bounciness=0.5,
+        **columns,
+    ):
+        # Same bodies as `count` constructor calls, but every value is written
+        # a whole column at a time. Values are per body or broadcast to all
+        # of them; other world columns (radius, color, ...) go in **columns.
+        world = cls.world
+        unknown = set(columns) - set(world.columns)
+        if unknown:
+            raise ValueError(f"unknown body columns: {', '.join(sorted(unknown))}")
+        if bounding_box_size is None:
+            bounding_box_size = [np.array([-0.5, 0, -0.5]), np.array([0.5, 1, 0.5])]
+        size = np.asarray(bounding_box_size, dtype=float)
+        bb_min, bb_max = (size[:, 0], size[:, 1]) if size.ndim == 3 else (size[0], size[1])
+
+        rows = world.add_rows(count)
+        values = dict(
+            columns,
+            position=0.0 if position is None else position,
+            velocity=0.0 if velocity is None else velocity,
+            mass=mass,
+            friction=friction,
+            bounciness=bounciness,
+            bb_min=bb_min,
+            bb_max=bb_max,
+            kind=cls.kind,
+        )
+        for name, value in values.items():
+            getattr(world, name)[rows] = value
+        world.previous_position[rows] = world.position[rows]
+
+        bodies = []
+        for index in rows.tolist():
+            body = cls.__new__(cls)
+            body._index = index
+            bodies.append(body)
+        world.bodies.extend(bodies)
+        return bodies
+
+    def get_render_position(self, alpha):
+        previous = self.world.previous_position[self._index]
+        return previous + (self.position - previous) * alpha
+
+    @property
+    def bounding_box_size(self):
+        return self.world.bb_min[self._index], self.world.bb_max[self._index]
+
+    @bounding_box_size.setter
+    def bounding_box_size(self, size):
+        self.world.bb_min[self._index] = size[0]
+        self.world.bb_max[self._index] = size[1]
+
+    def wake(self):
+        self.world.wake(self._index)
 
     def add_force(self, force):
         self.forces += np.array(force, dtype=float)
+        self.wake()
 
     def set_velocity(self, velocity):
-        self.velocity = np.array(velocity, dtype=float)
+        self.velocity = velocity
+        self.wake()
 
     def update(self, dt, gravity=9.8, ground_height=0.25, bounce=0.5):
         self.add_force([0, -gravity * self.mass, 0])
@@ -68,11 +163,71 @@ class RigidBody3D(Object3D):
         self.add_force([0, -gravity * self.mass, 0])
 
     @staticmethod
-    def check_all_collisions():
-        for i, obj_a in enumerate(RigidBody3D.instances):
-            for obj_b in RigidBody3D.instances[i + 1 :]:
-                obj_a.check_object_collision(obj_b)
-            # obj_a.draw_bounding_box()
+    def sleeping_tree():
+        # The tree holds the bodies that slept when it was built. Members
+        # that have since woken or moved are masked out, bodies that fell
+        # asleep later are not in it; it is rebuilt once those make up more
+        # than a tenth of the sleepers. Returns (tree, member rows, valid).
+        world = RigidBody3D.world
+        n = world.count
+        mins, maxs = world.get_aabbs()
+        bvh, members = RigidBody3D.sleeping_bvh, RigidBody3D.sleeping_rows
+        rows = np.minimum(members, n - 1)
+        valid = (
+            (members < n)
+            & ~world.awake[rows]
+            & np.all(mins[rows] == bvh.mins, axis=1)
+            & np.all(maxs[rows] == bvh.maxs, axis=1)
+        )
+        sleeping = np.flatnonzero(~world.awake[:n])
+        if len(sleeping) - valid.sum() > len(sleeping) // 10:
+            bvh.build(mins[sleeping], maxs[sleeping])
+            RigidBody3D.sleeping_rows = members = sleeping
+            valid = np.ones(len(sleeping), dtype=bool)
+        return bvh, members, valid
+
+    @staticmethod
+    def find_pairs(rows=None, aabbs=None):
+        # Overlapping pairs with at least one awake body, in broadphase
+        # order; rows limits both bodies to the given ascending indices and
+        # aabbs stands in for the world's boxes (sleepers keep their own).
+        # Two sleeping bodies cannot start touching each other, so the
+        # sleepers in the tree are only queried with the boxes of everything
+        # else.
+        world = RigidBody3D.world
+        n = world.count
+        subset = np.arange(n) if rows is None else rows
+        if world.awake[subset].all():
+            return RigidBody3D.broadphase.find_pairs(world, rows, aabbs)
+
+        bvh, members, valid = RigidBody3D.sleeping_tree()
+        in_tree = np.zeros(n, dtype=bool)
+        in_tree[members[valid]] = True
+        moving = subset[~in_tree[subset]]
+        pairs = RigidBody3D.broadphase.find_pairs(world, moving, aabbs)
+
+        mins, maxs = world.get_aabbs() if aabbs is None else aabbs
+        found = bvh.query(mins[moving], maxs[moving])
+        found = found[valid[found[:, 0]]]
+        still, other = members[found[:, 0]], moving[found[:, 1]]
+        if rows is not None:
+            inside = np.zeros(n, dtype=bool)
+            inside[rows] = True
+            still, other = still[inside[still]], other[inside[still]]
+
+        first = np.concatenate([pairs[:, 0], still])
+        second = np.concatenate([pairs[:, 1], other])
+        awake = world.awake[first] | world.awake[second]
+        return sort_pairs(first[awake], second[awake])
+
+    @staticmethod
+    def check_all_collisions(rows=None, pairs=None):
+        # Only pairs whose AABBs overlap reach the narrowphase; rows limits
+        # both bodies of a pair to the given ascending indices. Callers that
+        # already ran the broadphase this step pass its pairs.
+        if pairs is None:
+            pairs = RigidBody3D.find_pairs(rows)
+        resolve_body_pairs(RigidBody3D.world, pairs, RigidBody3D.solver)
 
     def get_aabb(self):
         # Returns world-space min and max of the bounding box
@@ -115,6 +270,10 @@ class RigidBody3D(Object3D):
             self.velocity, other.velocity = other.velocity.copy(), self.velocity.copy()
 
     def draw_bounding_box(self):
+        try:
+            from OpenGL.GL import glBegin, glEnd, glVertex3f, glColor3f, GL_LINES
+        except ImportError:
+            return
         min_bb, max_bb = self.get_aabb()
         # 8 corners of the box
         corners = [
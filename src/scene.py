@@ -0,0 +1,141 @@
+import json
+import os
+
+import numpy as np
+
+try:
+    import tomllib
+except ImportError:
+    tomllib = None
+
+import sim
+from ball import Ball
+from broadphase import BROADPHASES
+from collision_shape import CollisionShape
+from day_night_cycle import DayNightCycle
+from fixed_step import FixedStepScheduler
+from rigid_body_3d import RigidBody3D
+
+DEFAULT_SCENE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scenes", "default.json")
+BODY_TYPES = {"Ball": Ball, "RigidBody3D": RigidBody3D}
+
+PHYSICS_DEFAULTS = {
+    "gravity": 9.8,
+    "moon_gravity": 1.62,
+    "step_dt": 1 / 120,
+    "max_substeps": 8,
+    "sleep_speed": 0.05,
+    "sleep_time": 0.5,
+    "broadphase": "grid",
+    "solver_threads": 1,
+}
+DAY_NIGHT_DEFAULTS = {"time_of_day": 12.0, "day_speed": 0.05, "table_resolution": 1440}
+
+
+class Scene:
+    def __init__(self, physics, day_night, bodies, shapes, player=None):
+        self.physics = physics
+        self.day_night = day_night
+        self.bodies = bodies
+        self.shapes = shapes
+        self.player = player
+
+    def create_scheduler(self):
+        return FixedStepScheduler(self.physics["step_dt"], self.physics["max_substeps"])
+
+    def create_day_night(self):
+        cycle = DayNightCycle(self.day_night["table_resolution"])
+        cycle.day_speed = self.day_night["day_speed"]
+        cycle.time_of_day = self.day_night["time_of_day"] % 24
+        cycle.update(0.0)
+        return cycle
+
+
+def read_scene(path):
+    if path.endswith(".toml"):
+        if tomllib is None:
+            raise ValueError("TOML scenes need Python 3.11 or newer, use JSON instead")
+        with open(path, "rb") as file:
+            return tomllib.load(file)
+    with open(path) as file:
+        return json.load(file)
+
+
+def group_count(group):
+    # An explicit count, else the length of the first per-body position
+    # list, else a single entity
+    if "count" in group:
+        return int(group["count"])
+    position = np.asarray(group.get("position", ()), dtype=float)
+    return len(position) if position.ndim == 2 else 1
+
+
+def add_bodies(group):
+    group = dict(group)
+    cls = BODY_TYPES[group.pop("type", "Ball")]
+    count = group_count(group)
+    group.pop("count", None)
+    return cls.create_many(count, **group)
+
+
+def add_shapes(group):
+    count = group_count(group)
+    size = np.asarray(group["bounding_box_size"], dtype=float)
+    bb_mins, bb_maxs = (size[:, 0], size[:, 1]) if size.ndim == 3 else (size[0], size[1])
+    positions = np.broadcast_to(np.asarray(group.get("position", 0.0), dtype=float), (count, 3))
+    return CollisionShape.create_many(positions, bb_mins, bb_maxs)
+
+
+def generate(generator):
+    # Procedural content; returns (bodies, shapes) it created
+    generator = dict(generator)
+    kind = generator.pop("type")
+    if kind == "walls":
+        return [], sim.create_walls(**generator)
+    if kind == "balls":
+        return sim.spawn_balls(**generator), []
+    if kind == "obstacles":
+        return [], random_obstacles(**generator)
+    raise ValueError(f"unknown scene generator {kind!r}")
+
+
+def random_obstacles(count, seed=0, size=20, min_extent=0.2, max_extent=1.0, max_height=1.0):
+    # Boxes resting on the floor scattered over the size x size arena
+    rng = np.random.default_rng(seed)
+    half = rng.uniform(min_extent, max_extent, (count, 3)) / 2
+    half[:, 1] = rng.uniform(min_extent, max_height, count) / 2
+    positions = np.zeros((count, 3))
+    positions[:, [0, 2]] = rng.uniform(-size, size, (count, 2))
+    positions[:, 1] = half[:, 1]
+    return CollisionShape.create_many(positions, -half, half)
+
+
+def load_scene(source=DEFAULT_SCENE, reset=True):
+    # source is a .json/.toml path or an already parsed scene description.
+    # Entity groups are created one group at a time straight into the world
+    # columns; nothing is built per entity beyond its Python handle.
+    description = read_scene(source) if isinstance(source, str) else source
+    if reset:
+        sim.reset()
+
+    physics = dict(PHYSICS_DEFAULTS, **description.get("physics", {}))
+    day_night = dict(DAY_NIGHT_DEFAULTS, **description.get("day_night", {}))
+    world = RigidBody3D.world
+    world.sleep_speed, world.sleep_time = physics["sleep_speed"], physics["sleep_time"]
+    RigidBody3D.broadphase = BROADPHASES[physics["broadphase"]]()
+    RigidBody3D.set_solver_threads(physics["solver_threads"])
+
+    groups = description.get("bodies", [])
+    world.reserve(world.count + sum(group_count(group) for group in groups))
+    bodies, shapes = [], []
+    for group in groups:
+        bodies += add_bodies(group)
+    for group in description.get("shapes", []):
+        shapes += add_shapes(group)
+    for generator in description.get("generators", []):
+        new_bodies, new_shapes = generate(generator)
+        bodies += new_bodies
+        shapes += new_shapes
+
+    player = description.get("player")
+    return Scene(physics, day_night, bodies, shapes, None if player is None else bodies[player])
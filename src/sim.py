@@ -0,0 +1,115 @@
+import argparse
+import time
+
+import numpy as np
+
+from ball import Ball
+from rigid_body_3d import RigidBody3D
+from collision_shape import CollisionShape
+from profiler import NULL_PROFILER
+from ccd import resolve_fast_motion
+
+
+def reset():
+    RigidBody3D.world.clear()
+    del CollisionShape.instances[:]
+    CollisionShape.bvh.mark_dirty()
+
+
+def create_walls(size=20, thickness=2.0, height=20):
+    # Four static walls around the size x size floor used by MainScene
+    offset = size + thickness / 2
+    along_z = [(-thickness / 2, 0, -size), (thickness / 2, height, size)]
+    along_x = [(-size, 0, -thickness / 2), (size, height, thickness / 2)]
+    return [
+        CollisionShape(position=[offset, 0, 0], bounding_box_size=along_z),
+        CollisionShape(position=[-offset, 0, 0], bounding_box_size=along_z),
+        CollisionShape(position=[0, 0, -offset], bounding_box_size=along_x),
+        CollisionShape(position=[0, 0, offset], bounding_box_size=along_x),
+    ]
+
+
+def spawn_balls(count, seed=0, size=20, radius=0.4, speed=5.0, **kwargs):
+    rng = np.random.default_rng(seed)
+    limit = size - 1
+    positions = rng.uniform([-limit, 1, -limit], [limit, 10, limit], size=(count, 3))
+    velocities = rng.normal(0.0, speed, size=(count, 3))
+    # Same box-to-radius ratio as the 0.4 balls in MainScene
+    half = radius * 0.875
+    return Ball.create_many(
+        count,
+        position=positions,
+        velocity=velocities,
+        radius=radius,
+        bounding_box_size=(-half, half),
+        **kwargs,
+    )
+
+
+def step_physics(dt, gravity=9.8, player=None, keymap=None, profiler=NULL_PROFILER, ccd=True):
+    world = RigidBody3D.world
+    world.store_previous()
+    world.penetration[: world.count] = 0
+    advance(dt, gravity, player, keymap, profiler, ccd)
+
+
+def advance(
+    dt,
+    gravity=9.8,
+    player=None,
+    keymap=None,
+    profiler=NULL_PROFILER,
+    ccd=True,
+    rows=None,
+    input_dt=None,
+    pairs=None,
+):
+    # One collide-and-integrate pass over the ascending body indices `rows`,
+    # every body for None. Substeps pass the full step as input_dt so the
+    # player input is not scaled down with them.
+    with profiler.phase("collisions"):
+        RigidBody3D.check_all_collisions(rows, pairs)
+    with profiler.phase("shape_collisions"):
+        CollisionShape.check_all_collisions_with_rigidbody(rows)
+    if player is not None:
+        player.apply_input(dt if input_dt is None else input_dt, keymap or {})
+    world = RigidBody3D.world
+    start = world.position[: world.count].copy()
+    with profiler.phase("integrate"):
+        world.step(dt, gravity=gravity, rows=rows)
+    if ccd:
+        with profiler.phase("ccd"):
+            resolve_fast_motion(world, start, CollisionShape.bvh)
+
+
+def run(steps, bodies, dt=1 / 120, gravity=9.8, seed=0, threads=1):
+    reset()
+    RigidBody3D.set_solver_threads(threads)
+    create_walls()
+    spawn_balls(bodies, seed=seed)
+    start = time.perf_counter()
+    for _ in range(steps):
+        step_physics(dt, gravity)
+    return time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the physics without a window")
+    parser.add_argument("--steps", type=int, default=600)
+    parser.add_argument("--bodies", type=int, default=100)
+    parser.add_argument("--dt", type=float, default=1 / 120)
+    parser.add_argument("--gravity", type=float, default=9.8)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--threads", type=int, default=1, help="contact solver threads")
+    args = parser.parse_args(argv)
+
+    elapsed = run(args.steps, args.bodies, args.dt, args.gravity, args.seed, args.threads)
+    world = RigidBody3D.world
+    n = world.count
+    speeds = np.linalg.norm(world.velocity[:n], axis=1)
+    print(f"{args.steps} steps, {n} bodies in {elapsed:.3f} s ({args.steps / elapsed:.1f} steps/s)")
+    print(f"mean speed {speeds.mean():.3f} m/s, on ground {int(world.on_ground[:n].sum())}/{n}")
+
+
+if __name__ == "__main__":
+    main()
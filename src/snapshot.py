@@ -0,0 +1,132 @@
+import json
+import os
+import struct
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from ball import Ball
+from collision_shape import CollisionShape
+from physics_world import PhysicsWorld
+from rigid_body_3d import RigidBody3D
+
+MAGIC = b"GK3DSNAP"
+VERSION = 1
+# magic, version, length of the JSON table of contents that follows
+HEADER = struct.Struct("<8sHxxI")
+ALIGNMENT = 64
+# Body classes by the code stored in the "kind" column, KINDS[cls.kind] is cls
+KINDS = (RigidBody3D, Ball)
+
+# One background writer keeps saves in the order they were asked for
+_writer = ThreadPoolExecutor(max_workers=1)
+
+
+def capture(world=None, shapes=None):
+    # Copies of every column, cheap enough to take in the middle of a frame;
+    # the copies are what gets written, so the simulation can keep going
+    world = world or RigidBody3D.world
+    shapes = CollisionShape.instances if shapes is None else shapes
+    n = world.count
+    columns = {name: getattr(world, name)[:n].copy() for name in PhysicsWorld.columns}
+
+    aabbs = [(shape.position, shape.bounding_box_size) for shape in shapes]
+    columns["shape_position"] = np.array([p for p, _ in aabbs], dtype=float).reshape(-1, 3)
+    columns["shape_bb_min"] = np.array([size[0] for _, size in aabbs], dtype=float).reshape(-1, 3)
+    columns["shape_bb_max"] = np.array([size[1] for _, size in aabbs], dtype=float).reshape(-1, 3)
+    meta = {"sleep_speed": world.sleep_speed, "sleep_time": world.sleep_time}
+    return meta, columns
+
+
+def write_snapshot(path, meta, columns):
+    # Header, JSON table of contents, then every column as raw bytes at a
+    # 64-byte aligned offset. Written next to `path` and renamed over it, so
+    # a reader never sees half a file.
+    table, offset = {}, 0
+    for name, array in columns.items():
+        table[name] = {"dtype": array.dtype.str, "shape": array.shape, "offset": offset}
+        offset += -(-array.nbytes // ALIGNMENT) * ALIGNMENT
+    contents = json.dumps(dict(meta, version=VERSION, columns=table)).encode()
+    start = -(-(HEADER.size + len(contents)) // ALIGNMENT) * ALIGNMENT
+
+    temporary = f"{path}.tmp"
+    with open(temporary, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, len(contents)))
+        file.write(contents)
+        for name, array in columns.items():
+            file.seek(start + table[name]["offset"])
+            file.write(np.ascontiguousarray(array).tobytes())
+        file.truncate(start + offset)
+    os.replace(temporary, path)
+
+
+def save_snapshot(path, world=None, shapes=None):
+    write_snapshot(path, *capture(world, shapes))
+
+
+def save_snapshot_async(path, world=None, shapes=None):
+    # Copies the state now and writes it on the background thread; returns
+    # a Future that resolves once the file is in place
+    meta, columns = capture(world, shapes)
+    return _writer.submit(write_snapshot, path, meta, columns)
+
+
+def read_snapshot(path, mmap=True):
+    # Column arrays straight out of the file. With mmap they are
+    # copy-on-write views, pages are only read when touched and writes
+    # never reach the file.
+    with open(path, "rb") as file:
+        header = file.read(HEADER.size)
+        if len(header) < HEADER.size or header[:8] != MAGIC:
+            raise ValueError(f"{path} is not a world snapshot")
+        _, version, length = HEADER.unpack(header)
+        if version != VERSION:
+            raise ValueError(f"unsupported snapshot version {version}")
+        meta = json.loads(file.read(length))
+    start = -(-(HEADER.size + length) // ALIGNMENT) * ALIGNMENT
+
+    if mmap:
+        data = np.memmap(path, dtype=np.uint8, mode="c")
+    else:
+        data = np.fromfile(path, dtype=np.uint8)
+    columns = {}
+    for name, column in meta.pop("columns").items():
+        dtype, shape = np.dtype(column["dtype"]), tuple(column["shape"])
+        begin = start + column["offset"]
+        raw = data[begin : begin + dtype.itemsize * int(np.prod(shape))]
+        columns[name] = np.asarray(raw).view(dtype).reshape(shape)
+    return meta, columns
+
+
+def load_snapshot(path, mmap=True):
+    # Replaces every body and shape with the snapshot's. The world columns
+    # become the file's arrays and bodies are bare objects pointing at their
+    # row, so no per-body __init__ runs.
+    meta, columns = read_snapshot(path, mmap)
+    world = RigidBody3D.world
+    world.clear()
+    del CollisionShape.instances[:]
+
+    n = len(columns["kind"])
+    for name, (dtype, shape, default) in PhysicsWorld.columns.items():
+        # Columns added after the snapshot was written start at the default
+        if name not in columns:
+            columns[name] = np.full((n,) + shape, default, dtype=dtype)
+        setattr(world, name, columns[name])
+    world.count = world.capacity = n
+    world.sleep_speed, world.sleep_time = meta["sleep_speed"], meta["sleep_time"]
+
+    for index, kind in enumerate(columns["kind"].tolist()):
+        body = KINDS[kind].__new__(KINDS[kind])
+        body._index = index
+        world.bodies.append(body)
+
+    for position, bb_min, bb_max in zip(
+        columns["shape_position"], columns["shape_bb_min"], columns["shape_bb_max"]
+    ):
+        shape = CollisionShape.__new__(CollisionShape)
+        shape.position = np.array(position)
+        shape.bounding_box_size = [np.array(bb_min), np.array(bb_max)]
+        CollisionShape.instances.append(shape)
+    CollisionShape.bvh.mark_dirty()
+    return world.bodies, CollisionShape.instances
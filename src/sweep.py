@@ -0,0 +1,112 @@
+import argparse
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from ball import Ball
+from sim import create_walls, reset, step_physics
+
+PARAMETERS = ("force", "mass", "friction", "bounciness", "gravity")
+DEFAULTS = {
+    "force": 20.0,
+    "mass": 0.5,
+    "friction": 0.2,
+    "bounciness": 0.5,
+    "gravity": 9.8,
+}
+
+
+def parameter_grid(**values):
+    # Every combination of the given values as an (M, len(PARAMETERS)) array,
+    # parameters that are not given keep their MainScene default
+    unknown = set(values) - set(PARAMETERS)
+    if unknown:
+        raise ValueError(f"Unknown sweep parameters: {', '.join(sorted(unknown))}")
+    axes = [np.atleast_1d(values.get(name, DEFAULTS[name])) for name in PARAMETERS]
+    return np.array(list(itertools.product(*axes)), dtype=float)
+
+
+def simulate_launch(force, mass, friction, bounciness, gravity, steps, dt, rest_speed=0.05):
+    # One ball launched forward from the floor, like pressing space in
+    # MainScene, inside the arena walls
+    reset()
+    create_walls()
+    ball = Ball(
+        position=[5, 0.4, 0.0],
+        velocity=[0.0, 0.0, force],
+        radius=0.4,
+        mass=mass,
+        force=force,
+        friction=friction,
+        bounciness=bounciness,
+        bounding_box_size=(-0.35, 0.35, 0.35),
+    )
+    ball.on_ground = True
+
+    bounces = 0
+    last_moving = -1
+    previous = ball.velocity.copy()
+    for step in range(steps):
+        step_physics(dt, gravity)
+        velocity = ball.velocity
+        if np.any(velocity * previous < 0):
+            bounces += 1
+        if np.linalg.norm(velocity) >= rest_speed:
+            last_moving = step
+        previous = velocity.copy()
+
+    time_to_rest = (last_moving + 1) * dt if last_moving < steps - 1 else np.nan
+    return ball.position.copy(), time_to_rest, bounces
+
+
+def _run_chunk(args):
+    parameters, steps, dt = args
+    positions = np.empty((len(parameters), 3))
+    rest = np.empty(len(parameters))
+    bounces = np.empty(len(parameters), dtype=np.int32)
+    for i, row in enumerate(parameters):
+        positions[i], rest[i], bounces[i] = simulate_launch(*row, steps=steps, dt=dt)
+    return positions, rest, bounces
+
+
+def run_sweep(parameters, steps=2400, dt=1 / 120, workers=None, chunksize=None):
+    # Only the small parameter rows and result arrays cross process
+    # boundaries, each worker builds its own scene
+    parameters = np.asarray(parameters, dtype=float).reshape(-1, len(PARAMETERS))
+    workers = workers or os.cpu_count() or 1
+    chunksize = chunksize or max(1, -(-len(parameters) // (workers * 4)))
+    chunks = [
+        (parameters[i : i + chunksize], steps, dt)
+        for i in range(0, len(parameters), chunksize)
+    ]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(_run_chunk, chunks))
+
+    return {
+        "parameters": parameters,
+        "final_position": np.concatenate([r[0] for r in results]).reshape(-1, 3),
+        "time_to_rest": np.concatenate([r[1] for r in results]),
+        "bounces": np.concatenate([r[2] for r in results]),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sweep ball launch parameters")
+    for name in PARAMETERS:
+        parser.add_argument(f"--{name}", type=float, nargs="+", default=[DEFAULTS[name]])
+    parser.add_argument("--steps", type=int, default=2400)
+    parser.add_argument("--dt", type=float, default=1 / 120)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--out", default="sweep.npz")
+    args = parser.parse_args(argv)
+
+    grid = parameter_grid(**{name: getattr(args, name) for name in PARAMETERS})
+    results = run_sweep(grid, steps=args.steps, dt=args.dt, workers=args.workers)
+    np.savez(args.out, columns=np.array(PARAMETERS), **results)
+    print(f"{len(grid)} runs written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
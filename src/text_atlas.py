@@ -0,0 +1,90 @@
+import numpy as np
+import pygame
+from OpenGL.GL import *
+
+ATLAS_CHARS = "".join(chr(code) for code in range(32, 127))
+
+
+def pack_glyphs(sizes, max_width=512, padding=1):
+    # Shelf packing: glyphs left to right, a new row when the width runs out.
+    # Returns the top-left offset of every glyph and the atlas size.
+    offsets = []
+    x = y = row_height = 0
+    for width, height in sizes:
+        if x + width > max_width:
+            x, y = 0, y + row_height + padding
+            row_height = 0
+        offsets.append((x, y))
+        x += width + padding
+        row_height = max(row_height, height)
+    return offsets, (max_width, y + row_height)
+
+
+def layout_text(text, glyphs, atlas_size, x, y):
+    # GL_QUADS vertices and texture coordinates for `text` with its bottom
+    # left corner at (x, y) in a bottom-up ortho projection
+    fallback = glyphs["?"]
+    rects = np.array([glyphs.get(char, fallback) for char in text], dtype=np.float32)
+    rects = rects.reshape(-1, 4)
+    gx, gy, width, height = rects.T
+    left = x + np.cumsum(width) - width
+
+    vertices = np.empty((len(rects), 4, 2), dtype=np.float32)
+    vertices[:, :, 0] = left[:, None] + width[:, None] * [0, 1, 1, 0]
+    vertices[:, :, 1] = y + height[:, None] * [0, 0, 1, 1]
+
+    # The atlas is uploaded bottom row first, so v runs opposite to gy
+    atlas_width, atlas_height = atlas_size
+    u0, u1 = gx / atlas_width, (gx + width) / atlas_width
+    v0, v1 = 1 - (gy + height) / atlas_height, 1 - gy / atlas_height
+    texcoords = np.empty((len(rects), 4, 2), dtype=np.float32)
+    texcoords[:, :, 0] = np.stack([u0, u1, u1, u0], axis=1)
+    texcoords[:, :, 1] = np.stack([v0, v0, v1, v1], axis=1)
+    return vertices.reshape(-1, 2), texcoords.reshape(-1, 2)
+
+
+class GlyphAtlas:
+    # Every character of one font rasterized once into a single texture
+    def __init__(self, font, chars=ATLAS_CHARS):
+        surfaces = [font.render(char, True, (255, 255, 255)) for char in chars]
+        offsets, self.size = pack_glyphs([surface.get_size() for surface in surfaces])
+
+        atlas = pygame.Surface(self.size, pygame.SRCALPHA)
+        atlas.fill((255, 255, 255, 0))
+        self.glyphs = {}
+        for char, surface, (gx, gy) in zip(chars, surfaces, offsets):
+            atlas.blit(surface, (gx, gy))
+            self.glyphs[char] = (gx, gy) + surface.get_size()
+        self.pixels = pygame.image.tostring(atlas, "RGBA", True)
+        self.texture_id = None
+
+    def upload(self):
+        self.texture_id = glGenTextures(1)
+        glBindTexture(GL_TEXTURE_2D, self.texture_id)
+        glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA, self.size[0], self.size[1], 0, GL_RGBA, GL_UNSIGNED_BYTE, self.pixels)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
+
+    def supports(self, text):
+        return all(char in self.glyphs for char in text)
+
+    def layout(self, text, x, y):
+        return layout_text(text, self.glyphs, self.size, x, y)
+
+    def draw(self, text, x, y):
+        if self.texture_id is None:
+            self.upload()
+        vertices, texcoords = self.layout(text, x, y)
+        glBindTexture(GL_TEXTURE_2D, self.texture_id)
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glEnableClientState(GL_TEXTURE_COORD_ARRAY)
+        glVertexPointer(2, GL_FLOAT, 0, vertices)
+        glTexCoordPointer(2, GL_FLOAT, 0, texcoords)
+        glDrawArrays(GL_QUADS, 0, len(vertices))
+        glDisableClientState(GL_TEXTURE_COORD_ARRAY)
+        glDisableClientState(GL_VERTEX_ARRAY)
+
+    def delete(self):
+        if self.texture_id is not None:
+            glDeleteTextures([self.texture_id])
+            self.texture_id = None
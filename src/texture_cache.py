@@ -0,0 +1,72 @@
+from collections import OrderedDict
+
+
+class TextureCache:
+    # Least recently used entries are evicted once either the entry count or
+    # the byte total goes over its limit. on_evict(key, value) gets to free
+    # whatever the value holds (GL textures, for the HUD).
+    def __init__(self, max_entries=64, max_bytes=None, on_evict=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.on_evict = on_evict
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def get(self, key, default=None):
+        if key not in self.entries:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return self.entries[key][0]
+
+    def put(self, key, value, size=0):
+        if key in self.entries:
+            self._remove(key)
+        self.entries[key] = (value, size)
+        self.bytes += size
+        # The newest entry stays even if it alone is over max_bytes
+        while len(self.entries) > 1 and self._over_limit():
+            self._remove(next(iter(self.entries)))
+            self.evictions += 1
+
+    def get_or_create(self, key, create):
+        # create() returns (value, size)
+        value = self.get(key)
+        if value is None:
+            value, size = create()
+            self.put(key, value, size)
+        return value
+
+    def clear(self):
+        while self.entries:
+            self._remove(next(iter(self.entries)))
+
+    def stats(self):
+        return {
+            "entries": len(self.entries),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def _over_limit(self):
+        if self.max_entries is not None and len(self.entries) > self.max_entries:
+            return True
+        return self.max_bytes is not None and self.bytes > self.max_bytes
+
+    def _remove(self, key):
+        value, size = self.entries.pop(key)
+        self.bytes -= size
+        if self.on_evict is not None:
+            self.on_evict(key, value)
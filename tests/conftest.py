@@ -0,0 +1,12 @@
+import pytest
+
+import sim
+from rigid_body_3d import RigidBody3D
+
+
+@pytest.fixture
+def world():
+    # An empty shared world, emptied again after the test
+    sim.reset()
+    yield RigidBody3D.world
+    sim.reset()
@@ -0,0 +1,50 @@
+import sim
+from adaptive_step import AdaptiveStepper
+from rigid_body_3d import RigidBody3D
+
+
+def shoot(speed, adaptive, dt=1 / 60, steps=12):
+    # A ball fired along x at a resting one 1.5 m away, without CCD;
+    # returns both x positions and the deepest contact of any step
+    RigidBody3D.create_many(
+        2,
+        position=[[0, 0.4, 0], [1.5, 0.4, 0]],
+        velocity=[[speed, 0, 0], [0, 0, 0]],
+        bounding_box_size=(-0.35, 0.35),
+    )
+    world = RigidBody3D.world
+    stepper = AdaptiveStepper()
+    deepest = 0.0
+    for _ in range(steps):
+        if adaptive:
+            stepper.step(dt, ccd=False)
+        else:
+            sim.step_physics(dt, ccd=False)
+        deepest = max(deepest, world.penetration[:2].max())
+    return world.position[0, 0], world.position[1, 0], deepest
+
+
+def test_fast_body_does_not_pass_through_resting_body(world):
+    shooter, target, _ = shoot(130.0, adaptive=True)
+    assert shooter < target
+
+
+def test_fast_body_shares_its_substeps_with_the_body_ahead(world):
+    RigidBody3D.create_many(
+        3,
+        position=[[0, 0.4, 0], [1.5, 0.4, 0], [1.5, 0.4, 5]],
+        velocity=[[130, 0, 0], [0, 0, 0], [0, 0, 0]],
+        bounding_box_size=(-0.35, 0.35),
+    )
+    stepper = AdaptiveStepper()
+    stepper.step(1 / 60, ccd=False)
+    assert stepper.levels[0] > 1
+    assert stepper.levels[1] == stepper.levels[0]
+    assert stepper.levels[2] == 1
+
+
+def test_substeps_keep_contacts_shallow(world):
+    _, _, plain = shoot(60.0, adaptive=False)
+    sim.reset()
+    _, _, adaptive = shoot(60.0, adaptive=True)
+    assert adaptive < plain / 4
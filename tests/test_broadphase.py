@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from broadphase import BruteForceBroadphase, SpatialHashGrid, SweepAndPrune
+from physics_world import PhysicsWorld
+
+
+def random_world(count, seed=0, size=10.0):
+    rng = np.random.default_rng(seed)
+    world = PhysicsWorld()
+    rows = world.add_rows(count)
+    world.position[rows] = rng.uniform(-size, size, (count, 3))
+    half = rng.uniform(0.1, 1.5, (count, 3))
+    world.bb_min[rows] = -half
+    world.bb_max[rows] = half
+    return world
+
+
+# Fresh instances per test, SweepAndPrune keeps state between calls
+BROADPHASES = {
+    "sap": SweepAndPrune,
+    "sap_y": lambda: SweepAndPrune(axis=1),
+    "grid": SpatialHashGrid,
+    "grid_small_cells": lambda: SpatialHashGrid(cell_size=0.5),
+    "grid_large_cells": lambda: SpatialHashGrid(cell_size=4.0),
+}
+
+
+@pytest.mark.parametrize("name", BROADPHASES)
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_matches_brute_force(name, seed):
+    broadphase = BROADPHASES[name]()
+    world = random_world(500, seed)
+    expected = BruteForceBroadphase().find_pairs(world)
+    assert len(expected)
+    np.testing.assert_array_equal(broadphase.find_pairs(world), expected)
+
+
+@pytest.mark.parametrize("name", BROADPHASES)
+def test_rows_subset_matches_brute_force(name):
+    broadphase = BROADPHASES[name]()
+    world = random_world(500, seed=3)
+    rows = np.flatnonzero(np.random.default_rng(4).random(500) < 0.4)
+    expected = BruteForceBroadphase().find_pairs(world, rows)
+    assert np.isin(expected, rows).all()
+    np.testing.assert_array_equal(broadphase.find_pairs(world, rows), expected)
+
+
+@pytest.mark.parametrize("name", BROADPHASES)
+def test_follows_moving_bodies(name):
+    # SweepAndPrune keeps its order between calls, bodies added or moved in
+    # the meantime must still be found
+    broadphase = BROADPHASES[name]()
+    world = random_world(300, seed=5)
+    broadphase.find_pairs(world)
+    rng = np.random.default_rng(6)
+    world.position[: world.count] += rng.normal(0.0, 2.0, (world.count, 3))
+    rows = world.add_rows(50)
+    world.position[rows] = rng.uniform(-10, 10, (50, 3))
+    world.bb_max[rows] = 1.0
+    np.testing.assert_array_equal(
+        broadphase.find_pairs(world), BruteForceBroadphase().find_pairs(world)
+    )
+
+
+@pytest.mark.parametrize("name", BROADPHASES)
+def test_empty_and_touching(name):
+    broadphase = BROADPHASES[name]()
+    world = PhysicsWorld()
+    assert broadphase.find_pairs(world).shape == (0, 2)
+    rows = world.add_rows(3)
+    world.bb_max[rows] = 1.0
+    world.position[rows] = [[0, 0, 0], [1, 0, 0], [2.5, 0, 0]]
+    # Touching faces count as a contact, like check_object_collision
+    np.testing.assert_array_equal(broadphase.find_pairs(world), [[0, 1]])
@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+
+from broadphase import aabbs_overlap
+from ccd import body_impacts, fast_rows, swept_pairs
+from physics_world import PhysicsWorld
+
+
+def brute_swept_pairs(swept_min, swept_max, rows):
+    # Every fast body against every body, two fast bodies from the lower row
+    is_fast = np.zeros(len(swept_min), dtype=bool)
+    is_fast[rows] = True
+    pairs = [
+        (fast, other)
+        for fast in rows.tolist()
+        for other in range(len(swept_min))
+        if other != fast
+        and not (is_fast[other] and other < fast)
+        and aabbs_overlap(swept_min[fast], swept_max[fast], swept_min[other], swept_max[other])
+    ]
+    return np.array(pairs, dtype=int).reshape(-1, 2)
+
+
+def random_world(seed, count=400, spread=15.0):
+    rng = np.random.default_rng(seed)
+    world = PhysicsWorld()
+    rows = world.add_rows(count)
+    world.position[rows] = rng.uniform(-spread, spread, (count, 3))
+    extent = rng.uniform(0.2, 1.0, (count, 1))
+    world.bb_min[rows], world.bb_max[rows] = -extent, extent
+    start = world.position[:count].copy()
+    # A few bodies move far, the rest drift
+    velocity = rng.normal(0.0, 0.05, (count, 3))
+    fast = rng.choice(count, count // 10, replace=False)
+    velocity[fast] = rng.normal(0.0, 6.0, (len(fast), 3))
+    world.position[:count] += velocity
+    return world, start
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_swept_pairs_match_brute_force(seed):
+    world, start = random_world(seed)
+    n = world.count
+    end = world.position[:n]
+    swept_min = np.minimum(start, end) + world.bb_min[:n]
+    swept_max = np.maximum(start, end) + world.bb_max[:n]
+    rows = fast_rows(world, start)
+    assert len(rows)
+
+    fast, other = swept_pairs(swept_min, swept_max, rows)
+    expected = brute_swept_pairs(swept_min, swept_max, rows)
+    np.testing.assert_array_equal(np.stack([fast, other], axis=1), expected)
+
+
+def test_swept_pairs_without_fast_or_slow_bodies():
+    world, start = random_world(3, count=30)
+    n = world.count
+    swept_min = np.minimum(start, world.position[:n]) - 1.0
+    swept_max = np.maximum(start, world.position[:n]) + 1.0
+    for rows in (np.empty(0, dtype=int), np.arange(n)):
+        fast, other = swept_pairs(swept_min, swept_max, rows)
+        expected = brute_swept_pairs(swept_min, swept_max, rows)
+        np.testing.assert_array_equal(np.stack([fast, other], axis=1), expected)
+
+
+def test_swept_pairs_for_a_body_crossing_the_world():
+    # Spans more grid cells than there are slow bodies
+    world, start = random_world(4, count=200)
+    world.position[7] = start[7] + 1000.0
+    n = world.count
+    end = world.position[:n]
+    swept_min = np.minimum(start, end) + world.bb_min[:n]
+    swept_max = np.maximum(start, end) + world.bb_max[:n]
+    rows = fast_rows(world, start)
+
+    fast, other = swept_pairs(swept_min, swept_max, rows)
+    expected = brute_swept_pairs(swept_min, swept_max, rows)
+    np.testing.assert_array_equal(np.stack([fast, other], axis=1), expected)
+    assert (fast == 7).any()
+
+
+def test_fast_body_hits_resting_body():
+    world = PhysicsWorld()
+    rows = world.add_rows(3)
+    world.bb_min[rows], world.bb_max[rows] = -0.4, 0.4
+    world.position[rows] = [[0.0, 0.4, 0.0], [1.5, 0.4, 0.0], [0.0, 0.4, 9.0]]
+    start = world.position[:3].copy()
+    # 130 m/s over one 1/60 s step carries the first ball through the second
+    world.position[0, 0] += 130.0 / 60
+
+    impacted, times, axes, others = body_impacts(world, start, fast_rows(world, start))
+    assert impacted.tolist() == [0] and others.tolist() == [1] and axes.tolist() == [0]
+    assert times[0] == pytest.approx((1.5 - 0.8) / (130.0 / 60))
@@ -0,0 +1,53 @@
+from math import cos, pi, sin
+
+import numpy as np
+import pytest
+
+from day_night_cycle import DayNightCycle, build_cycle_table, sample_cycle_table
+
+
+def per_frame_state(time_of_day):
+    # The formulas the original DayNightCycle evaluated every frame
+    if 6 < time_of_day < 18:
+        progress = (time_of_day - 6) / 12
+        if time_of_day < 12:
+            sky = (0.3 + 0.2 * progress, 0.5 + 0.2 * progress, 0.8 + 0.2 * progress)
+        else:
+            sky = (0.5 - 0.2 * (progress - 0.5), 0.7 - 0.2 * (progress - 0.5), 1.0 - 0.3 * (progress - 0.5))
+    else:
+        progress = (time_of_day - 18) / 12 if time_of_day > 18 else (time_of_day + 6) / 12
+        darkness = 0.1 + 0.9 * (1 - abs(progress - 0.5) * 2)
+        sky = (0.05 * darkness, 0.05 * darkness, 0.15 * darkness)
+    sun_angle = (time_of_day / 24) * 2 * pi - pi / 2
+    moon_angle = (time_of_day / 24) * 2 * pi + pi / 2
+    sun = (20 * cos(sun_angle), max(0, 20 * sin(sun_angle)), 10)
+    moon = (20 * cos(moon_angle), max(0, 20 * sin(moon_angle)), 10)
+    sun_intensity = max(0.2, sin(pi * (time_of_day - 6) / 12))
+    moon_intensity = max(0.1, 0.3 * sin(pi * (time_of_day - 18) / 12))
+    return sky + sun + moon + (sun_intensity, moon_intensity)
+
+
+@pytest.mark.parametrize("time_of_day", [0.0, 5.5, 6.5, 9.0, 12.0, 17.25, 20.0, 23.75])
+def test_table_rows_match_per_frame_formulas(time_of_day):
+    # Whole minutes fall exactly on a row of the default table
+    state = sample_cycle_table(build_cycle_table(), time_of_day)
+    np.testing.assert_allclose(state, per_frame_state(time_of_day), atol=1e-12)
+
+
+@pytest.mark.parametrize("time_of_day", [3.3, 7.77, 9.123, 14.51, 16.013, 20.4, 23.99])
+def test_sampling_between_rows_stays_close(time_of_day):
+    # Away from the jumps at 6:00 and 18:00 a minute of linear
+    # interpolation is well below a visible difference
+    state = sample_cycle_table(build_cycle_table(), time_of_day)
+    np.testing.assert_allclose(state, per_frame_state(time_of_day), atol=1e-4)
+
+
+def test_cycle_getters_use_the_table():
+    cycle = DayNightCycle()
+    # 12:00 plus eight hours
+    cycle.update(8.0 / cycle.day_speed)
+    expected = per_frame_state(cycle.time_of_day)
+    np.testing.assert_allclose(cycle.get_sky_color(), expected[0:3], atol=1e-4)
+    np.testing.assert_allclose(cycle.get_sun_position(), expected[3:6], atol=1e-4)
+    np.testing.assert_allclose(cycle.get_moon_position(), expected[6:9], atol=1e-4)
+    assert not cycle.is_daytime
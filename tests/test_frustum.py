@@ -0,0 +1,48 @@
+import numpy as np
+
+from frustum import Frustum, look_at_matrix, perspective_matrix
+
+
+def test_boxes_in_front_are_kept_and_the_rest_culled():
+    # At the origin looking down -z with a 90 degree view: at distance d
+    # the visible square is d wide on each side of the axis
+    frustum = Frustum(perspective_matrix(90.0, 1.0, 1.0, 50.0), look_at_matrix((0, 0, 0), (0, 0, -1)))
+    centers = np.array(
+        [
+            (0, 0, -5),  # straight ahead
+            (-4.9, 0, -5),  # just inside the left edge
+            (5.4, 0, -5),  # straddling the right edge
+            (0, 0, 5),  # behind
+            (-20, 0, -5),  # left
+            (20, 0, -5),  # right
+            (0, 20, -5),  # above
+            (0, -20, -5),  # below
+            (0, 0, -0.3),  # before the near plane at 1
+            (0, 0, -60),  # past the far plane
+        ],
+        dtype=float,
+    )
+    visible = frustum.contains_aabbs(centers - 0.5, centers + 0.5)
+    assert visible.tolist() == [True] * 3 + [False] * 7
+    assert frustum.visible_rows(centers - 0.5, centers + 0.5).tolist() == [0, 1, 2]
+
+
+def test_points_match_clip_space():
+    # Zero-size boxes are kept exactly when the point lands inside the
+    # clip volume, for a camera away from the origin
+    projection = perspective_matrix(45.0, 1000 / 600, 0.1, 50.0)
+    view = look_at_matrix((3.0, 2.0, 6.0), (0.0, 0.4, 0.0))
+    points = np.random.default_rng(0).uniform(-30, 30, (5000, 3))
+
+    clip = np.c_[points, np.ones(len(points))] @ (projection @ view).T
+    inside = np.all(np.abs(clip[:, :3]) <= clip[:, 3:], axis=1)
+    visible = Frustum(projection, view).contains_aabbs(points, points)
+    assert 50 < inside.sum() < len(points)
+    np.testing.assert_array_equal(visible, inside)
+
+
+def test_look_at_matches_glu():
+    # gluLookAt from (0, 0, 5) at the origin is a translation by -5 in z
+    expected = np.identity(4)
+    expected[2, 3] = -5.0
+    np.testing.assert_allclose(look_at_matrix((0, 0, 5), (0, 0, 0)), expected, atol=1e-12)
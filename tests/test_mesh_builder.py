@@ -0,0 +1,159 @@
+from math import cos, pi, sin
+
+import numpy as np
+import pytest
+
+from mesh_builder import (
+    MeshBuilder,
+    build_ground_mesh,
+    build_instance_matrices,
+    build_wall_quads,
+    cube_triangles,
+    half_sphere_triangles,
+    meridian_lines,
+    rotation_matrix,
+)
+from r2d2_mesh import build_r2d2_mesh
+
+
+def immediate_ground(size, tile_size):
+    # The glColor3f / glVertex3f calls the old MainScene.draw_ground made
+    rows = []
+    for x in range(-size, size):
+        for z in range(-size, size):
+            color = (0.3, 0.3, 0.3) if (x + z) % 2 == 0 else (0.7, 0.7, 0.7)
+            for corner_x, corner_z in [(x, z), (x, z + 1), (x + 1, z + 1), (x + 1, z)]:
+                rows.append(color + (corner_x * tile_size, 0, corner_z * tile_size))
+    return np.array(rows, dtype=np.float32)
+
+
+def immediate_walls(size):
+    # The old draw_walls quads, one list per wall
+    walls = [[], [], [], []]
+    for x in range(-size, size):
+        walls[0].append([(x, 0, -size), (x, size, -size), (x + 1, size, -size), (x + 1, 0, -size)])
+        walls[1].append([(x, 0, size), (x + 1, 0, size), (x + 1, size, size), (x, size, size)])
+        walls[2].append([(-size, 0, x), (-size, size, x), (-size, size, x + 1), (-size, 0, x + 1)])
+        walls[3].append([(size, 0, x), (size, 0, x + 1), (size, size, x + 1), (size, size, x)])
+    return np.array(walls, dtype=np.float32)
+
+
+def immediate_half_sphere(radius, slices, stacks):
+    # The GL_QUAD_STRIP loop of draw_half_sphere, split into two triangles
+    # per quad
+    vertices, normals = [], []
+    for i in range(stacks // 2, stacks):
+        lat0, lat1 = pi * (-0.5 + i / stacks), pi * (-0.5 + (i + 1) / stacks)
+        strip = []
+        for j in range(slices + 1):
+            lng = 2 * pi * j / slices
+            for lat in (lat0, lat1):
+                strip.append((cos(lng) * cos(lat), sin(lng) * cos(lat), sin(lat)))
+        for j in range(slices):
+            a, b, c, d = strip[2 * j], strip[2 * j + 1], strip[2 * j + 3], strip[2 * j + 2]
+            for normal in (a, b, c, a, c, d):
+                normals.append(normal)
+                vertices.append(tuple(radius * n for n in normal))
+    return np.array(vertices), np.array(normals)
+
+
+def immediate_ball_matrix(position, axis, angle, radius):
+    # glTranslatef(position), glRotatef(angle, axis), then gluSphere(radius)
+    translation = np.identity(4)
+    translation[:3, 3] = position
+    rotation = rotation_matrix(angle, *axis) if np.any(axis) else np.identity(4)
+    return translation @ rotation @ np.diag([radius, radius, radius, 1.0])
+
+
+def immediate_meridians():
+    # The eight GL_LINE_STRIPs drawn over each ball, on a unit sphere
+    strips = []
+    for i in range(0, 360, 45):
+        phi = np.radians(i)
+        strips.append(
+            [(sin(theta) * cos(phi), cos(theta), sin(theta) * sin(phi)) for theta in np.linspace(0, pi, 32)]
+        )
+    return np.array(strips)
+
+
+@pytest.mark.parametrize("size, tile_size", [(20, 1), (3, 2), (1, 0.5)])
+def test_ground_mesh_matches_immediate_mode(size, tile_size):
+    mesh = build_ground_mesh(size, tile_size)
+    assert mesh.dtype == np.float32
+    np.testing.assert_array_equal(mesh, immediate_ground(size, tile_size))
+
+
+@pytest.mark.parametrize("size", [20, 4])
+def test_wall_quads_match_immediate_mode(size):
+    np.testing.assert_array_equal(build_wall_quads(size), immediate_walls(size))
+
+
+@pytest.mark.parametrize("radius, slices, stacks", [(0.4, 32, 16), (1.0, 8, 6)])
+def test_half_sphere_matches_quad_strips(radius, slices, stacks):
+    vertices, normals = half_sphere_triangles(radius, slices, stacks)
+    expected_vertices, expected_normals = immediate_half_sphere(radius, slices, stacks)
+    np.testing.assert_allclose(vertices, expected_vertices, atol=1e-12)
+    np.testing.assert_allclose(normals, expected_normals, atol=1e-12)
+
+
+def test_instance_matrices_match_immediate_mode():
+    rng = np.random.default_rng(3)
+    positions = rng.uniform(-20, 20, (50, 3))
+    axes = rng.normal(size=(50, 3))
+    axes[:5] = 0.0
+    angles = rng.uniform(-720, 720, 50)
+    radii = rng.uniform(0.1, 2.0, 50)
+
+    matrices = build_instance_matrices(positions, axes, angles, radii)
+    assert matrices.dtype == np.float32 and matrices.shape == (50, 4, 4)
+    for matrix, position, axis, angle, radius in zip(matrices, positions, axes, angles, radii):
+        # Column-major, so the transpose is the matrix glMultMatrixf applies
+        expected = immediate_ball_matrix(position, axis, angle, radius)
+        np.testing.assert_allclose(matrix.T, expected, rtol=1e-5, atol=1e-5)
+
+
+def test_meridian_lines_match_line_strips():
+    strips = immediate_meridians()
+    expected = np.stack([strips[:, :-1], strips[:, 1:]], axis=2).reshape(-1, 3)
+    np.testing.assert_allclose(meridian_lines(), expected, atol=1e-12)
+
+
+def test_builder_applies_the_matrix_stack():
+    mesh = MeshBuilder()
+    mesh.color(1.0, 0.0, 0.0)
+    mesh.push_matrix()
+    mesh.translate(1, 2, 3)
+    mesh.rotate(90, 0, 0, 1)
+    mesh.scale(2, 1, 1)
+    mesh.cube()
+    mesh.pop_matrix()
+    mesh.color(0.0, 0.0, 1.0)
+    mesh.cube()
+    vertices, normals, colors = mesh.build()
+
+    cube, cube_normals = cube_triangles()
+    translation = np.identity(4)
+    translation[:3, 3] = (1, 2, 3)
+    matrix = translation @ rotation_matrix(90, 0, 0, 1) @ np.diag([2.0, 1.0, 1.0, 1.0])
+    moved = cube @ matrix[:3, :3].T + matrix[:3, 3]
+    turned = cube_normals @ rotation_matrix(90, 0, 0, 1)[:3, :3].T
+    np.testing.assert_allclose(vertices[:36], moved, atol=1e-6)
+    np.testing.assert_allclose(normals[:36], turned, atol=1e-6)
+    # pop_matrix went back to the identity for the second cube
+    np.testing.assert_allclose(vertices[36:], cube, atol=1e-6)
+    np.testing.assert_array_equal(colors[:36], np.tile([1.0, 0.0, 0.0], (36, 1)))
+    np.testing.assert_array_equal(colors[36:], np.tile([0.0, 0.0, 1.0], (36, 1)))
+
+
+def test_r2d2_mesh_counts_and_bounds():
+    vertices, normals, colors = build_r2d2_mesh()
+    # 4 cylinders and 4 disks of 32 slices, 21 cubes and a 32 x 8 dome
+    # band, every quad as two triangles
+    expected = 4 * 32 * 6 + 4 * 32 * 6 + 21 * 36 + 32 * 8 * 6
+    assert len(vertices) == len(normals) == len(colors) == expected
+    np.testing.assert_allclose(np.linalg.norm(normals, axis=1), 1.0, atol=1e-6)
+    # Worked out from the immediate-mode draw_r2d2: lower arms at x = 0.675,
+    # feet down to y = -0.25, dome top at y = 1.705, the 0.51 lower ring
+    # and dome and feet reaching z = 0.55
+    np.testing.assert_allclose(vertices.min(axis=0), [-0.675, -0.25, -0.51], atol=1e-6)
+    np.testing.assert_allclose(vertices.max(axis=0), [0.675, 1.705, 0.55], atol=1e-6)
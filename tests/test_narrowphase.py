@@ -0,0 +1,119 @@
+import numpy as np
+import pytest
+
+from collision_shape import CollisionShape
+from narrowphase import ContactSolver, contact_batches, resolve_body_pairs, resolve_shape_contacts
+from rigid_body_3d import RigidBody3D
+
+
+def sequential_batches(*bodies):
+    # The per-contact greedy assignment contact_batches has to reproduce
+    last_batch = {}
+    batch_of = np.empty(len(bodies[0]), dtype=int)
+    for k, contact in enumerate(zip(*(b.tolist() for b in bodies))):
+        batch = 1 + max(last_batch.get(body, -1) for body in contact)
+        batch_of[k] = batch
+        for body in contact:
+            last_batch[body] = batch
+    order = np.argsort(batch_of, kind="stable")
+    return np.split(order, np.flatnonzero(np.diff(batch_of[order])) + 1) if len(order) else []
+
+
+def crowded_bodies(count, seed):
+    rng = np.random.default_rng(seed)
+    return RigidBody3D.create_many(
+        count,
+        position=rng.uniform(-3, 3, (count, 3)),
+        velocity=rng.normal(0, 2, (count, 3)),
+        bounding_box_size=(-0.5, 0.5),
+        bounciness=rng.uniform(0, 1, count),
+    )
+
+
+@pytest.mark.parametrize("bodies, contacts", [(10, 40), (200, 1000), (3000, 5000)])
+def test_contact_batches_match_sequential(bodies, contacts):
+    rng = np.random.default_rng(bodies)
+    a = rng.integers(0, bodies, contacts)
+    b = rng.integers(0, bodies, contacts)
+    for args in [(a,), (a, b)]:
+        expected = sequential_batches(*args)
+        batches = contact_batches(*args)
+        assert len(batches) == len(expected)
+        for batch, reference in zip(batches, expected):
+            np.testing.assert_array_equal(batch, reference)
+            # No body in two contacts of the same batch
+            touched = [set(contact) for contact in zip(*(arg[batch].tolist() for arg in args))]
+            assert sum(map(len, touched)) == len(set().union(*touched))
+
+
+def test_contact_batches_chain_and_empty():
+    chain = np.arange(50)
+    assert [len(batch) for batch in contact_batches(chain, chain + 1)] == [1] * 50
+    assert contact_batches(np.empty(0, dtype=int), np.empty(0, dtype=int)) == []
+
+
+def test_body_pairs_match_check_object_collision(world):
+    bodies = crowded_bodies(300, seed=0)
+    pairs = RigidBody3D.broadphase.find_pairs(world)
+    assert len(pairs) > 300
+    start_position = world.position[: world.count].copy()
+    start_velocity = world.velocity[: world.count].copy()
+
+    for a, b in pairs.tolist():
+        bodies[a].check_object_collision(bodies[b])
+    expected = world.position[: world.count].copy(), world.velocity[: world.count].copy()
+
+    world.position[: world.count] = start_position
+    world.velocity[: world.count] = start_velocity
+    resolve_body_pairs(world, pairs)
+    np.testing.assert_array_equal(world.position[: world.count], expected[0])
+    np.testing.assert_array_equal(world.velocity[: world.count], expected[1])
+
+
+def test_threaded_solver_matches_serial(world):
+    crowded_bodies(300, seed=1)
+    pairs = RigidBody3D.broadphase.find_pairs(world)
+    start_position = world.position[: world.count].copy()
+    start_velocity = world.velocity[: world.count].copy()
+    resolve_body_pairs(world, pairs)
+    expected = world.position[: world.count].copy(), world.velocity[: world.count].copy()
+
+    # An overhead of one contact splits every batch across all workers
+    solver = ContactSolver(workers=3, chunk_overhead=1)
+    world.position[: world.count] = start_position
+    world.velocity[: world.count] = start_velocity
+    resolve_body_pairs(world, pairs, solver)
+    solver.shutdown()
+    np.testing.assert_array_equal(world.position[: world.count], expected[0])
+    np.testing.assert_array_equal(world.velocity[: world.count], expected[1])
+
+
+def test_chunk_count_grows_with_batch_size():
+    solver = ContactSolver(workers=4, chunk_overhead=350)
+    assert [solver.chunk_count(count) for count in (0, 1000, 1400, 3150, 5600, 10**6)] == [0, 1, 2, 3, 4, 4]
+    assert ContactSolver(workers=1).chunk_count(10**6) == 1
+    solver.shutdown()
+
+
+def test_shape_contacts_match_check_collision_with_rigidbody(world):
+    bodies = crowded_bodies(200, seed=1)
+    rng = np.random.default_rng(2)
+    shapes = CollisionShape.create_many(
+        rng.uniform(-3, 3, (20, 3)), -rng.uniform(0.2, 2, (20, 3)), rng.uniform(0.2, 2, (20, 3))
+    )
+    CollisionShape.rebuild_bvh()
+    bvh = CollisionShape.bvh
+    pairs = np.stack(np.meshgrid(np.arange(20), np.arange(200), indexing="ij"), axis=-1).reshape(-1, 2)
+    pairs = pairs[rng.permutation(len(pairs))]
+    start_position = world.position[: world.count].copy()
+    start_velocity = world.velocity[: world.count].copy()
+
+    for shape, body in pairs.tolist():
+        shapes[shape].check_collision_with_rigidbody(bodies[body])
+    expected = world.position[: world.count].copy(), world.velocity[: world.count].copy()
+
+    world.position[: world.count] = start_position
+    world.velocity[: world.count] = start_velocity
+    resolve_shape_contacts(world, CollisionShape.positions, bvh.mins, bvh.maxs, pairs)
+    np.testing.assert_array_equal(world.position[: world.count], expected[0])
+    np.testing.assert_array_equal(world.velocity[: world.count], expected[1])
@@ -0,0 +1,75 @@
+import os
+import shutil
+
+import numpy as np
+import pytest
+
+from adaptive_step import AdaptiveStepper
+from replay import KEYS, ReplayMismatch, ReplayReader, ReplayWriter, replay
+from scene import DEFAULT_SCENE, load_scene
+
+OBSTACLE_SCENE = os.path.join(os.path.dirname(DEFAULT_SCENE), "obstacle_field.json")
+
+
+def record(path, scene_path=DEFAULT_SCENE, frames=90):
+    # What main.py does each frame, with random frame times and keys
+    scene = load_scene(scene_path)
+    player = scene.player
+    scheduler = scene.create_scheduler()
+    stepper = AdaptiveStepper()
+    rng = np.random.default_rng(5)
+    with ReplayWriter(path, scheduler.step_dt, scheduler.max_substeps, scene_path=scene_path) as writer:
+        for frame in range(frames):
+            dt = rng.uniform(0.005, 0.04)
+            keymap = {key: bool(rng.random() < 0.2) for key in KEYS}
+            player.force = 20.0 + 5 * (frame // 30)
+            scheduler.advance(dt, lambda step_dt: stepper.step(step_dt, 9.8, player=player, keymap=keymap))
+            writer.write_frame(dt, keymap, 9.8, player.force)
+    return player.position.copy()
+
+
+@pytest.mark.parametrize("scene_path", [DEFAULT_SCENE, OBSTACLE_SCENE], ids=["default", "obstacle_field"])
+def test_record_then_replay(world, tmp_path, scene_path):
+    path = str(tmp_path / "session.gkr")
+    recorded = record(path, scene_path, frames=30)
+
+    reader = ReplayReader(path)
+    assert reader.scene_path == os.path.abspath(scene_path)
+    assert len(list(reader)) == 30
+    # The recorded scene is loaded without naming it again
+    frames, player = replay(path)
+    assert frames == 30
+    np.testing.assert_array_equal(player.position, recorded)
+
+
+def test_replay_in_another_scene_names_the_recorded_one(world, tmp_path):
+    path = str(tmp_path / "session.gkr")
+    record(path, OBSTACLE_SCENE, frames=5)
+    with pytest.raises(ReplayMismatch, match="recorded with scene .*obstacle_field.json"):
+        replay(path, scene_path=DEFAULT_SCENE)
+
+
+def test_replay_refuses_an_edited_scene(world, tmp_path):
+    scene_path = str(tmp_path / "scene.json")
+    shutil.copy(DEFAULT_SCENE, scene_path)
+    path = str(tmp_path / "session.gkr")
+    record(path, scene_path, frames=5)
+    with open(scene_path, "a") as file:
+        file.write("\n")
+    with pytest.raises(ReplayMismatch, match="different contents"):
+        replay(path)
+
+
+def test_diverged_state_is_reported(world, tmp_path):
+    path = str(tmp_path / "session.gkr")
+    record(path, frames=20)
+    # Flip a bit in the last frame's checksum
+    with open(path, "r+b") as file:
+        file.seek(-1, os.SEEK_END)
+        last = file.read(1)
+        file.seek(-1, os.SEEK_END)
+        file.write(bytes([last[0] ^ 1]))
+    with pytest.raises(ReplayMismatch, match="frame 19"):
+        replay(path)
+    # Without verification it runs to the end
+    assert replay(path, verify=False)[0] == 20
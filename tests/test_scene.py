@@ -0,0 +1,32 @@
+import numpy as np
+
+from collision_shape import CollisionShape
+from scene import load_scene
+
+
+def test_broadcast_shapes_get_their_own_arrays(world):
+    scene = load_scene(
+        {"shapes": [{"count": 3, "position": [1, 0, 2], "bounding_box_size": [[-1, 0, -1], [1, 2, 1]]}]}
+    )
+    first, second, third = scene.shapes
+    first.position[0] = 5.0
+    first.bounding_box_size[1][1] = 4.0
+    np.testing.assert_array_equal(second.position, [1, 0, 2])
+    np.testing.assert_array_equal(third.bounding_box_size[1], [1, 2, 1])
+    second.set_position([0, 0, 0])
+    assert CollisionShape.bvh.dirty
+
+
+def test_groups_and_generators(world):
+    scene = load_scene(
+        {
+            "player": 1,
+            "bodies": [{"type": "Ball", "position": [[0, 1, 0], [3, 1, 0]], "force": 15.0}],
+            "generators": [{"type": "walls", "size": 10}, {"type": "obstacles", "count": 20, "seed": 3}],
+        }
+    )
+    assert world.count == 2 and scene.player is scene.bodies[1]
+    assert scene.player.force == 15.0
+    assert len(scene.shapes) == 24
+    mins, maxs = CollisionShape.get_aabbs()
+    assert np.all(mins <= maxs)
@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+import sim
+from broadphase import BruteForceBroadphase
+from narrowphase import resolve_body_pairs
+from rigid_body_3d import RigidBody3D
+
+
+def test_stacked_balls_fall_asleep(world):
+    # Bottom ball on the ground, the top one resting on it
+    RigidBody3D.create_many(
+        2, position=[[0, 0.4, 0], [0, 1.1, 0]], bounding_box_size=(-0.35, 0.35)
+    )
+    for _ in range(240):
+        sim.step_physics(1 / 120)
+    assert not world.awake[:2].any()
+    assert world.position[1, 1] > world.position[0, 1]
+
+
+def test_add_force_wakes(world):
+    (body,) = RigidBody3D.create_many(1, position=[0, 0.4, 0])
+    world.sleep([0])
+    body.add_force([10, 0, 0])
+    assert body.awake
+    assert world.sleep_timer[0] == 0
+
+
+def test_only_contacts_with_a_sleeper_wake(world):
+    # An awake pair sharing a batch with a sleeper contact keeps its timers
+    RigidBody3D.create_many(
+        4, position=[[0, 0, 0], [0.9, 0, 0], [5, 0, 0], [5.9, 0, 0]], bounding_box_size=(-0.5, 0.5)
+    )
+    world.sleep_timer[:4] = [0.1, 0.2, 0.0, 0.0]
+    world.sleep([3])
+    resolve_body_pairs(world, np.array([[0, 1], [2, 3]]))
+    np.testing.assert_array_equal(world.sleep_timer[:2], [0.1, 0.2])
+    assert world.awake[3] and world.sleep_timer[3] == 0
+
+
+def test_resting_body_settles_onto_sleeper(world):
+    RigidBody3D.create_many(2, position=[[0, 0, 0], [0.995, 0, 0]], bounding_box_size=(-0.5, 0.5))
+    world.sleep_timer[:2] = [0.1, 1.0]
+    world.sleep([1])
+    resolve_body_pairs(world, np.array([[0, 1]]))
+    assert not world.awake[:2].any()
+
+
+def test_deep_contact_with_sleeper_is_resolved(world):
+    # A body momentarily slow, like a ball at the top of a bounce, that
+    # sinks into a sleeper is pushed out instead of frozen inside it
+    RigidBody3D.create_many(2, position=[[0, 0, 0], [0.9, 0, 0]], bounding_box_size=(-0.5, 0.5))
+    world.sleep_timer[:2] = [0.1, 1.0]
+    world.sleep([1])
+    resolve_body_pairs(world, np.array([[0, 1]]))
+    assert world.awake[:2].all()
+    assert world.position[1, 0] - world.position[0, 0] == pytest.approx(1.0)
+
+
+def test_find_pairs_skips_sleeping_pairs(world):
+    rng = np.random.default_rng(0)
+    count = 600
+    RigidBody3D.create_many(
+        count, position=rng.uniform(-8, 8, (count, 3)), bounding_box_size=(-0.6, 0.6)
+    )
+    brute = BruteForceBroadphase()
+    for step in range(6):
+        # Bodies fall asleep, wake up and move between calls
+        world.awake[:count] = rng.random(count) < 0.3
+        moved = world.awake[:count] & (rng.random(count) < 0.5)
+        world.position[:count][moved] += rng.normal(0, 0.5, (moved.sum(), 3))
+        rows = None if step % 2 else np.flatnonzero(rng.random(count) < 0.7)
+
+        expected = brute.find_pairs(world, rows)
+        expected = expected[world.awake[expected[:, 0]] | world.awake[expected[:, 1]]]
+        np.testing.assert_array_equal(RigidBody3D.find_pairs(rows), expected)
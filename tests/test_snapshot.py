@@ -0,0 +1,82 @@
+import numpy as np
+
+import sim
+from ball import Ball
+from collision_shape import CollisionShape
+from physics_world import PhysicsWorld
+from rigid_body_3d import RigidBody3D
+from snapshot import capture, load_snapshot, save_snapshot, save_snapshot_async
+
+
+def build_scene(world):
+    sim.create_walls()
+    sim.spawn_balls(150, seed=4, force=np.linspace(5, 40, 150))
+    RigidBody3D.create_many(3, position=[[0, 3, 0], [2, 3, 0], [4, 3, 0]], mass=2.0)
+    for _ in range(30):
+        sim.step_physics(1 / 120)
+
+
+def state(world):
+    n = world.count
+    return world.position[:n].copy(), world.velocity[:n].copy(), world.awake[:n].copy()
+
+
+def test_round_trip_restores_everything(world, tmp_path):
+    build_scene(world)
+    path = tmp_path / "world.snap"
+    save_snapshot(path)
+    _, saved = capture()
+    shapes = [
+        (np.array(shape.position), [np.array(size, dtype=float) for size in shape.bounding_box_size])
+        for shape in CollisionShape.instances
+    ]
+    kinds = [type(body) for body in world.bodies]
+    forces = [float(body.force) for body in world.bodies if isinstance(body, Ball)]
+
+    sim.reset()
+    bodies, loaded_shapes = load_snapshot(path)
+    assert world.count == len(bodies) == 153
+    for name in PhysicsWorld.columns:
+        np.testing.assert_array_equal(getattr(world, name)[: world.count], saved[name])
+    assert [type(body) for body in bodies] == kinds
+    assert [float(body.force) for body in bodies if isinstance(body, Ball)] == forces
+    assert len(loaded_shapes) == len(shapes)
+    for shape, (position, (bb_min, bb_max)) in zip(loaded_shapes, shapes):
+        np.testing.assert_array_equal(shape.position, position)
+        np.testing.assert_array_equal(shape.bounding_box_size[0], bb_min)
+        np.testing.assert_array_equal(shape.bounding_box_size[1], bb_max)
+
+
+def test_resumed_sim_matches_uninterrupted(world, tmp_path):
+    build_scene(world)
+    path = tmp_path / "world.snap"
+    save_snapshot_async(path).result()
+    for _ in range(60):
+        sim.step_physics(1 / 120)
+    expected = state(world)
+
+    sim.reset()
+    load_snapshot(path)
+    for _ in range(60):
+        sim.step_physics(1 / 120)
+    for resumed, uninterrupted in zip(state(world), expected):
+        np.testing.assert_array_equal(resumed, uninterrupted)
+
+
+def test_adding_bodies_after_load_grows_capacity(world, tmp_path):
+    build_scene(world)
+    path = tmp_path / "world.snap"
+    save_snapshot(path)
+    sim.reset()
+    load_snapshot(path)
+    before = world.position[: world.count].copy()
+    assert world.capacity == world.count
+
+    ball = Ball(position=[1, 5, 1], force=12)
+    more = RigidBody3D.create_many(10, position=[0, 8, 0])
+    assert world.count == 164 and world.capacity >= 164
+    assert ball._index == 153 and [body._index for body in more] == list(range(154, 164))
+    np.testing.assert_array_equal(world.position[:153], before)
+    np.testing.assert_array_equal(ball.position, [1, 5, 1])
+    assert ball.force == 12 and isinstance(world.bodies[-1], RigidBody3D)
+    sim.step_physics(1 / 120)
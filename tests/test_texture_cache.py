@@ -0,0 +1,57 @@
+from texture_cache import TextureCache
+
+
+def test_evicts_least_recently_used():
+    evicted = []
+    cache = TextureCache(max_entries=2, on_evict=lambda key, value: evicted.append(key))
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert evicted == ["b"]
+    assert "a" in cache and "c" in cache and "b" not in cache
+    assert cache.stats() == {"entries": 2, "bytes": 0, "hits": 1, "misses": 0, "evictions": 1}
+
+
+def test_byte_limit_keeps_newest_entry():
+    cache = TextureCache(max_entries=None, max_bytes=100)
+    cache.put("a", 1, size=60)
+    cache.put("b", 2, size=30)
+    cache.put("c", 3, size=50)
+    assert list(cache.entries) == ["b", "c"] and cache.bytes == 80
+    # A single entry over the limit is kept rather than thrashing
+    cache.put("huge", 4, size=500)
+    assert list(cache.entries) == ["huge"] and cache.bytes == 500
+
+
+def test_replacing_a_key_frees_the_old_value():
+    evicted = []
+    cache = TextureCache(on_evict=lambda key, value: evicted.append(value))
+    cache.put("a", "old", size=10)
+    cache.put("a", "new", size=4)
+    assert evicted == ["old"]
+    assert cache.get("a") == "new" and cache.bytes == 4 and cache.evictions == 0
+
+
+def test_get_or_create_only_creates_on_a_miss():
+    created = []
+
+    def create():
+        created.append(1)
+        return "texture", 16
+
+    cache = TextureCache()
+    assert cache.get_or_create("hello", create) == "texture"
+    assert cache.get_or_create("hello", create) == "texture"
+    assert len(created) == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_clear_frees_everything():
+    evicted = []
+    cache = TextureCache(on_evict=lambda key, value: evicted.append(key))
+    for key in "abc":
+        cache.put(key, key, size=1)
+    cache.clear()
+    assert sorted(evicted) == ["a", "b", "c"]
+    assert len(cache) == 0 and cache.bytes == 0